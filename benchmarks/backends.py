@@ -0,0 +1,183 @@
+#!/usr/bin/env python
+# encoding: utf-8
+
+# The MIT License (MIT)
+
+# Copyright (c) 2016 CNRS
+
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+# AUTHORS
+# Hervé BREDIN - http://herve.niderb.fr
+
+"""
+Compare Yaafe and NumPy backends (speed and, when yaafelib is available,
+agreement within documented tolerance)
+
+Reference outputs can be saved on a host with yaafelib (short synthetic wav
+file and one .npy file per extractor in <directory>) and NumPy backend
+checked against them anywhere else. The check reports maximum absolute and
+relative errors (from which numpy_backend.RTOL and ATOL are set) and exits
+with status 1 when they exceed documented tolerance.
+
+Usage:
+  backends [--duration=<seconds>]
+  backends --save-reference [--duration=<seconds>] [<directory>]
+  backends --check-reference [<directory>]
+  backends -h | --help
+
+Options:
+  --duration=<seconds>    Duration of synthetic audio [default: 60.0].
+  --save-reference        Save yaafelib outputs (requires yaafelib). Use a
+                          short duration (e.g. 2.0) to keep files small.
+  --check-reference       Check NumPy backend against saved yaafelib outputs.
+  -h --help               Show this screen.
+
+<directory> defaults to benchmarks/reference.
+"""
+
+from __future__ import print_function
+
+import os
+import sys
+import tempfile
+import time
+
+import numpy as np
+from docopt import docopt
+
+from pyannote.features.audio import numpy_backend
+from pyannote.features.audio.yaafe import YaafeMFCC, YaafeZCR, yaafelib
+from pyannote.features.applications import SpeechActivityDetectionFeatures
+
+from benchmarks.synthetic import write
+
+EXTRACTORS = {
+    'zcr': lambda backend: YaafeZCR(backend=backend),
+    'mfcc': lambda backend: YaafeMFCC(
+        e=True, coefs=11, De=True, DDe=True, D=True, DD=True,
+        backend=backend),
+    'sad': lambda backend: SpeechActivityDetectionFeatures(backend=backend),
+}
+
+
+REFERENCE = os.path.join(os.path.dirname(__file__), 'reference')
+REFERENCE_WAV = 'reference.wav'
+
+
+def timeit(extractor, path):
+    t = time.time()
+    features = extractor.extract(path)
+    return time.time() - t, features.data
+
+
+def save_reference(directory, duration):
+    """Save synthetic wav file and yaafelib outputs into `directory`"""
+
+    if yaafelib is None:
+        sys.exit('Saving reference outputs requires yaafelib.')
+
+    if not os.path.isdir(directory):
+        os.makedirs(directory)
+
+    path = write(os.path.join(directory, REFERENCE_WAV), duration)
+    for name, extractor in sorted(EXTRACTORS.items()):
+        data = extractor('yaafe').extract(path).data
+        np.save(os.path.join(directory, name + '.npy'), data)
+        print('{name:>5s} | saved {shape} reference'.format(
+            name=name, shape=data.shape))
+
+
+def check_reference(directory):
+    """Check NumPy backend against yaafelib outputs saved in `directory`
+
+    Returns
+    -------
+    agree : bool
+        Whether all extractors agree within documented tolerance.
+    """
+
+    path = os.path.join(directory, REFERENCE_WAV)
+    if not os.path.exists(path):
+        sys.exit('Missing reference outputs in "{directory}" (save them with '
+                 '--save-reference on a host with yaafelib).'.format(
+                     directory=directory))
+
+    all_agree = True
+    for name, extractor in sorted(EXTRACTORS.items()):
+
+        expected = np.load(os.path.join(directory, name + '.npy'))
+        data = extractor('numpy').extract(path).data
+
+        if data.shape != expected.shape:
+            print('{name:>5s} | shape mismatch: {shape} instead of '
+                  '{expected}'.format(name=name, shape=data.shape,
+                                      expected=expected.shape))
+            all_agree = False
+            continue
+
+        error = np.abs(data - expected)
+        relative = error / np.maximum(np.abs(expected), numpy_backend.ATOL)
+        agree = np.allclose(data, expected, rtol=numpy_backend.RTOL,
+                            atol=numpy_backend.ATOL)
+        print('{name:>5s} | max abs error {error:.1e} | max rel error '
+              '{relative:.1e} | within backend tolerance: {agree}'.format(
+                  name=name, error=np.max(error), relative=np.max(relative),
+                  agree=agree))
+        all_agree = all_agree and agree
+
+    return all_agree
+
+
+if __name__ == '__main__':
+
+    arguments = docopt(__doc__)
+    duration = float(arguments['--duration'])
+    directory = arguments['<directory>'] or REFERENCE
+
+    if arguments['--save-reference']:
+        save_reference(directory, duration)
+        sys.exit(0)
+
+    if arguments['--check-reference']:
+        sys.exit(0 if check_reference(directory) else 1)
+
+    _, path = tempfile.mkstemp(suffix='.wav')
+    write(path, duration)
+
+    backends = ['numpy'] if yaafelib is None else ['yaafe', 'numpy']
+
+    try:
+        for name, extractor in sorted(EXTRACTORS.items()):
+            data = {}
+            for backend in backends:
+                elapsed, data[backend] = timeit(extractor(backend), path)
+                print('{name:>5s} | {backend:>5s} | {elapsed:.3f}s '
+                      '| {speed:.0f}x real-time'.format(
+                          name=name, backend=backend, elapsed=elapsed,
+                          speed=duration / elapsed))
+            if len(data) > 1:
+                assert data['yaafe'].shape == data['numpy'].shape
+                agree = np.allclose(data['numpy'], data['yaafe'],
+                                    rtol=numpy_backend.RTOL,
+                                    atol=numpy_backend.ATOL)
+                print('{name:>5s} | backends agree: {agree}'.format(
+                    name=name, agree=agree))
+    finally:
+        os.remove(path)
@@ -0,0 +1,97 @@
+#!/usr/bin/env python
+# encoding: utf-8
+
+# The MIT License (MIT)
+
+# Copyright (c) 2016 CNRS
+
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+# AUTHORS
+# Hervé BREDIN - http://herve.niderb.fr
+"""
+Benchmark bulk conversion of segments to frame ranges: vectorized integer
+arithmetic (YaafeFrame.segments_to_frame_ranges) against one float
+computation per segment (SlidingWindow.crop).
+
+Usage:
+  cropping [--segments=<N>] [--duration=<seconds>]
+  cropping -h | --help
+
+Options:
+  --segments=<N>          Number of segments [default: 10000].
+  --duration=<seconds>    Duration of (virtual) features [default: 3600.0].
+  -h --help               Show this screen.
+"""
+
+from __future__ import print_function
+
+import time
+
+import numpy as np
+from docopt import docopt
+from pyannote.core import Segment
+
+from pyannote.features.audio.yaafe import YaafeFrame
+
+
+if __name__ == '__main__':
+
+    arguments = docopt(__doc__)
+    n_segments = int(arguments['--segments'])
+    duration = float(arguments['--duration'])
+
+    frame = YaafeFrame(blockSize=512, stepSize=256, sampleRate=16000)
+    n_frames = int(duration * frame.sampleRate) // frame.stepSize
+
+    # segment boundaries with 10ms resolution (e.g. from an annotation)
+    random = np.random.RandomState(1234)
+    start = np.round(random.uniform(0, duration, size=n_segments), 2)
+    end = np.round(start + random.uniform(0, 10, size=n_segments), 2)
+    segments = [Segment(s, e) for s, e in zip(start, end)]
+
+    t = time.time()
+    loop = []
+    for segment in segments:
+        indices = frame.crop(segment, mode='loose')
+        indices = indices[(indices > -1) & (indices < n_frames)]
+        loop.append((indices[0], indices[-1] + 1) if len(indices) else None)
+    t_loop = time.time() - t
+
+    t = time.time()
+    ranges = frame.segments_to_frame_ranges(segments, n_frames=n_frames)
+    t_segments = time.time() - t
+
+    t = time.time()
+    frame.segments_to_frame_ranges(np.stack([start, end], axis=1),
+                                   n_frames=n_frames)
+    t_array = time.time() - t
+
+    n_diff = sum(1 for (first, last), other in zip(ranges, loop)
+                 if other is not None and (first, last) != other)
+
+    print('per-segment crop          | {t:.3f}s'.format(t=t_loop))
+    print('vectorized (Segment list) | {t:.3f}s | {speed:.0f}x faster'.format(
+        t=t_segments, speed=t_loop / t_segments))
+    print('vectorized (numpy array)  | {t:.3f}s | {speed:.0f}x faster'.format(
+        t=t_array, speed=t_loop / t_array))
+    # SlidingWindow.crop also includes frames that merely touch a segment
+    # boundary and is subject to float rounding
+    print('{n:d} of {total:d} ranges differ from per-segment crop'.format(
+        n=n_diff, total=n_segments))
@@ -0,0 +1,109 @@
+#!/usr/bin/env python
+# encoding: utf-8
+
+# The MIT License (MIT)
+
+# Copyright (c) 2016 CNRS
+
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+# AUTHORS
+# Hervé BREDIN - http://herve.niderb.fr
+"""
+Compare float32 and float64 computation paths of the NumPy backend
+(throughput and accuracy of float32 features with respect to float64 ones)
+
+Usage:
+  dtype [--duration=<seconds>] [--repeat=<N>]
+  dtype -h | --help
+
+Options:
+  --duration=<seconds>    Duration of synthetic audio [default: 600.0].
+  --repeat=<N>            Keep best of <N> runs [default: 3].
+  -h --help               Show this screen.
+"""
+
+from __future__ import print_function
+
+import os
+import tempfile
+import time
+
+import numpy as np
+from docopt import docopt
+
+from pyannote.features.audio.yaafe import YaafeMFCC, YaafeZCR
+from pyannote.features.applications import SpeechActivityDetectionFeatures
+
+from benchmarks.synthetic import write
+
+# relative error is computed with respect to max(|float64 value|, FLOOR)
+FLOOR = 1e-3
+
+EXTRACTORS = {
+    'zcr': lambda dtype: YaafeZCR(backend='numpy', dtype=dtype),
+    'mfcc': lambda dtype: YaafeMFCC(
+        e=True, coefs=11, De=True, DDe=True, D=True, DD=True,
+        backend='numpy', dtype=dtype),
+    'sad': lambda dtype: SpeechActivityDetectionFeatures(
+        backend='numpy', dtype=dtype),
+}
+
+
+def timeit(extractor, path, repeat=3):
+    elapsed = []
+    for _ in range(repeat):
+        t = time.time()
+        features = extractor.extract(path)
+        elapsed.append(time.time() - t)
+    return min(elapsed), features.data
+
+
+if __name__ == '__main__':
+
+    arguments = docopt(__doc__)
+    duration = float(arguments['--duration'])
+    repeat = int(arguments['--repeat'])
+
+    _, path = tempfile.mkstemp(suffix='.wav')
+    write(path, duration)
+
+    try:
+        for name, extractor in sorted(EXTRACTORS.items()):
+
+            data = {}
+            for dtype in [np.float64, np.float32]:
+                elapsed, data[dtype] = timeit(extractor(dtype), path,
+                                              repeat=repeat)
+                print('{name:>5s} | {dtype:>7s} | {elapsed:.3f}s '
+                      '| {speed:.0f}x real-time | {size:.1f}MB'.format(
+                          name=name, dtype=np.dtype(dtype).name,
+                          elapsed=elapsed, speed=duration / elapsed,
+                          size=data[dtype].nbytes / 2. ** 20))
+
+            # NumPy backend tolerance with respect to yaafelib is not
+            # measured yet: errors are reported as is.
+            error = np.abs(data[np.float32] - data[np.float64])
+            relative = error / np.maximum(np.abs(data[np.float64]), FLOOR)
+            print('{name:>5s} | max abs error {error:.1e} | max rel error '
+                  '{relative:.1e}'.format(
+                      name=name, error=np.max(error),
+                      relative=np.max(relative)))
+    finally:
+        os.remove(path)
@@ -0,0 +1,92 @@
+#!/usr/bin/env python
+# encoding: utf-8
+
+# The MIT License (MIT)
+
+# Copyright (c) 2016 CNRS
+
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+# AUTHORS
+# Hervé BREDIN - http://herve.niderb.fr
+
+"""
+Benchmark Yaafe engine caching on many short files
+
+Usage:
+  engine_cache [--files=<N>] [--duration=<seconds>]
+  engine_cache -h | --help
+
+Options:
+  --files=<N>             Number of synthetic wav files [default: 200].
+  --duration=<seconds>    Duration of each file [default: 2.0].
+  -h --help               Show this screen.
+"""
+
+from __future__ import print_function
+
+import shutil
+import tempfile
+import time
+
+import numpy as np
+from docopt import docopt
+
+from pyannote.features.audio.yaafe import YaafeMFCC
+
+from benchmarks.synthetic import write_many
+
+
+def run(paths, cached=True):
+    """Return per-file latency (in seconds)"""
+
+    extractor = YaafeMFCC(e=True, coefs=11, De=True, DDe=True, D=True, DD=True)
+
+    latencies = []
+    for path in paths:
+        if not cached:
+            # new extractor, hence new engine, for every file
+            extractor = YaafeMFCC(
+                e=True, coefs=11, De=True, DDe=True, D=True, DD=True)
+        t = time.time()
+        extractor.extract(path)
+        latencies.append(time.time() - t)
+
+    return np.array(latencies)
+
+
+if __name__ == '__main__':
+
+    arguments = docopt(__doc__)
+    n_files = int(arguments['--files'])
+    duration = float(arguments['--duration'])
+
+    directory = tempfile.mkdtemp()
+    try:
+        paths = write_many(directory, n_files, duration)
+        for cached in [False, True]:
+            latencies = run(paths, cached=cached)
+            print('{cache:>8s} | mean {mean:.2f}ms | median {median:.2f}ms'
+                  ' | total {total:.2f}s'.format(
+                      cache='cached' if cached else 'uncached',
+                      mean=1000 * np.mean(latencies),
+                      median=1000 * np.median(latencies),
+                      total=np.sum(latencies)))
+    finally:
+        shutil.rmtree(directory)
@@ -0,0 +1,180 @@
+#!/usr/bin/env python
+# encoding: utf-8
+
+# The MIT License (MIT)
+
+# Copyright (c) 2016 CNRS
+
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+# AUTHORS
+# Hervé BREDIN - http://herve.niderb.fr
+
+"""
+Benchmark MFCC + derivatives extraction with previous and current YaafeMFCC
+definitions. Both are loaded into the very same kind of engine (the one
+YaafeMFCC itself builds for the selected backend), so that the comparison
+includes whatever the engine already factorizes on its own.
+
+Previous definition has one MFCC step per feature (static, first and second
+order) with different coefficient selections. Current definition uses the
+same MFCC step for all three and drops unrequested columns afterwards (which
+is included in the timing). Both only differ when energy flags (e, De, DDe)
+differ, so all their combinations are benchmarked.
+
+Usage:
+  mfcc_derivatives [--duration=<seconds>] [--repeat=<N>] [--backend=<name>]
+  mfcc_derivatives -h | --help
+
+Options:
+  --duration=<seconds>    Duration of synthetic audio [default: 600.0].
+  --repeat=<N>            Number of runs (best one is reported) [default: 3].
+  --backend=<name>        Use "yaafe" or "numpy" backend, or "all" for both
+                          (yaafe being skipped when yaafelib is not
+                          available) [default: all].
+  -h --help               Show this screen.
+"""
+
+from __future__ import print_function
+
+import itertools
+import time
+
+import numpy as np
+from docopt import docopt
+
+from pyannote.features.audio import yaafe
+from pyannote.features.audio.numpy_backend import NumpyEngine
+from pyannote.features.audio.yaafe import YaafeMFCC
+
+from benchmarks.synthetic import SAMPLE_RATE, generate
+
+
+class CountingEngine(NumpyEngine):
+    """NumpyEngine counting the number of FFT'ed frames"""
+
+    n_fft = 0
+
+    def _spectrum(self, frames, window):
+        self.n_fft += len(frames)
+        return super(CountingEngine, self)._spectrum(frames, window)
+
+
+def legacy_definition(mfcc):
+    """Previous YaafeMFCC definition with one MFCC step per feature"""
+
+    step = "MFCC CepsIgnoreFirstCoeff=%d CepsNbCoeffs=%d " \
+           "blockSize=%d stepSize=%d"
+    size = (mfcc.block_size, mfcc.step_size)
+
+    return [
+        ("mfcc", step % ((0 if mfcc.e else 1, mfcc.coefs + mfcc.e) + size)),
+        ("mfcc_d", step % ((0 if mfcc.De else 1,
+                            mfcc.D * mfcc.coefs + mfcc.De) + size) +
+         " > Derivate DOrder=1"),
+        ("mfcc_dd", step % ((0 if mfcc.DDe else 1,
+                             mfcc.DD * mfcc.coefs + mfcc.DDe) + size) +
+         " > Derivate DOrder=2"),
+    ]
+
+
+def build_engine(mfcc, definition):
+    """Engine used by `mfcc` for `definition`
+
+    NumPy engines also count the number of FFT'ed frames.
+    """
+    if mfcc.backend == yaafe.BACKEND_NUMPY:
+        engine = CountingEngine(sample_rate=mfcc.sample_rate,
+                                dtype=mfcc._engine_dtype)
+        engine.load(definition)
+        return engine
+    return mfcc._build_engine(definition)
+
+
+def run(mfcc, definition, columns, audio, repeat):
+    """Return best processing time and number of FFT'ed frames
+
+    Number of FFT'ed frames is None when unknown (yaafe backend).
+    """
+
+    engine = build_engine(mfcc, definition)
+    counting = isinstance(engine, CountingEngine)
+
+    elapsed = []
+    for _ in range(repeat):
+        if counting:
+            engine.n_fft = 0
+        t = time.time()
+        features = engine.processAudio(audio)
+        for name, c in columns.items():
+            features[name] = features[name][:, c]
+        elapsed.append(time.time() - t)
+
+    return min(elapsed), engine.n_fft if counting else None
+
+
+def fmt_fft(n_fft):
+    return '-' if n_fft is None else '{0:d}'.format(n_fft)
+
+
+if __name__ == '__main__':
+
+    arguments = docopt(__doc__)
+    duration = float(arguments['--duration'])
+    repeat = int(arguments['--repeat'])
+    backend = arguments['--backend']
+
+    if backend == 'all':
+        backends = [yaafe.BACKEND_NUMPY]
+        if yaafe.yaafelib is not None:
+            backends.append(yaafe.BACKEND_YAAFE)
+        else:
+            print('yaafelib is not available: skipping yaafe backend.')
+    else:
+        backends = [backend]
+
+    audio = generate(duration).astype(np.float64).reshape(1, -1)
+
+    # both definitions are identical when all energy flags are equal
+    for backend in backends:
+        for e, De, DDe in itertools.product([False, True], repeat=3):
+
+            mfcc = YaafeMFCC(sample_rate=SAMPLE_RATE, e=e, coefs=11,
+                             De=De, D=True, DDe=DDe, DD=True,
+                             backend=backend)
+            case = '+'.join(['mfcc'] + [flag for flag, value in
+                                        [('e', e), ('De', De), ('DDe', DDe)]
+                                        if value])
+
+            results = {}
+            for name, definition, columns in [
+                    ('legacy', legacy_definition(mfcc), {}),
+                    ('shared', mfcc.definition(), mfcc.columns())]:
+                results[name] = run(mfcc, definition, columns,
+                                    audio.astype(mfcc._engine_dtype), repeat)
+
+            print('{backend:>5s} | {case:<15s} | legacy {legacy:.3f}s '
+                  '({legacy_fft} FFT frames) | shared {shared:.3f}s '
+                  '({shared_fft} FFT frames) | speed-up: {speed:.2f}x'.format(
+                      backend=backend, case=case,
+                      legacy=results['legacy'][0],
+                      legacy_fft=fmt_fft(results['legacy'][1]),
+                      shared=results['shared'][0],
+                      shared_fft=fmt_fft(results['shared'][1]),
+                      speed=results['legacy'][0] / results['shared'][0]))
@@ -0,0 +1,92 @@
+#!/usr/bin/env python
+# encoding: utf-8
+
+# The MIT License (MIT)
+
+# Copyright (c) 2016 CNRS
+
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+# AUTHORS
+# Hervé BREDIN - http://herve.niderb.fr
+
+"""
+Benchmark per-push latency of online feature extraction
+
+Usage:
+  online [--push=<ms>] [--duration=<seconds>] [--backend=<name>]
+  online -h | --help
+
+Options:
+  --push=<ms>             Duration of pushed audio, in ms [default: 20].
+  --duration=<seconds>    Duration of synthetic stream [default: 60.0].
+  --backend=<name>        Feature extraction backend [default: numpy].
+  -h --help               Show this screen.
+"""
+
+from __future__ import print_function
+
+import time
+
+import numpy as np
+from docopt import docopt
+
+from pyannote.features.audio.yaafe import YaafeMFCC, YaafeZCR
+from pyannote.features.audio.yaafe import OnlineFeatureExtractor
+from pyannote.features.applications import SpeechActivityDetectionFeatures
+
+from benchmarks.synthetic import SAMPLE_RATE, generate
+
+EXTRACTORS = {
+    'zcr': lambda backend: YaafeZCR(backend=backend),
+    'mfcc': lambda backend: YaafeMFCC(
+        e=True, coefs=11, De=True, DDe=True, D=True, DD=True,
+        backend=backend),
+    'sad': lambda backend: SpeechActivityDetectionFeatures(backend=backend),
+}
+
+
+if __name__ == '__main__':
+
+    arguments = docopt(__doc__)
+    push = int(float(arguments['--push']) * SAMPLE_RATE / 1000)
+    duration = float(arguments['--duration'])
+    backend = arguments['--backend']
+
+    audio = generate(duration)
+
+    for name, extractor in sorted(EXTRACTORS.items()):
+
+        online = OnlineFeatureExtractor(extractor(backend))
+
+        latencies = []
+        for i in range(0, len(audio), push):
+            t = time.time()
+            online.push(audio[i:i + push])
+            latencies.append(time.time() - t)
+        online.flush()
+
+        latencies = 1000. * np.array(latencies)
+        print('{name:>5s} | algorithmic latency {latency:.1f}ms '
+              '| per push: p50 {p50:.3f}ms p95 {p95:.3f}ms '
+              'max {max:.3f}ms'.format(
+                  name=name, latency=1000. * online.latency,
+                  p50=np.percentile(latencies, 50),
+                  p95=np.percentile(latencies, 95),
+                  max=np.max(latencies)))
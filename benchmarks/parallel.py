@@ -0,0 +1,91 @@
+#!/usr/bin/env python
+# encoding: utf-8
+
+# The MIT License (MIT)
+
+# Copyright (c) 2016 CNRS
+
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+# AUTHORS
+# Hervé BREDIN - http://herve.niderb.fr
+
+"""
+Benchmark parallel feature extraction over a synthetic corpus
+
+Usage:
+  parallel [--files=<N>] [--duration=<seconds>] [--backend=<name>]
+           [--chunksize=<N>] [<n_jobs>...]
+  parallel -h | --help
+
+Options:
+  --files=<N>             Number of synthetic wav files [default: 200].
+  --duration=<seconds>    Duration of each file [default: 30.0].
+  --backend=<name>        Feature extraction backend [default: numpy].
+  --chunksize=<N>         Number of files sent to workers at once [default: 4].
+  -h --help               Show this screen.
+"""
+
+from __future__ import print_function
+
+import multiprocessing
+import shutil
+import tempfile
+import time
+
+from docopt import docopt
+
+from pyannote.features.audio.yaafe import YaafeMFCC
+
+from benchmarks.synthetic import write_many
+
+
+if __name__ == '__main__':
+
+    arguments = docopt(__doc__)
+    n_files = int(arguments['--files'])
+    duration = float(arguments['--duration'])
+    backend = arguments['--backend']
+    chunksize = int(arguments['--chunksize'])
+    n_jobs = [int(n) for n in arguments['<n_jobs>']]
+    if not n_jobs:
+        n_jobs = sorted(set([1, 2, 4, multiprocessing.cpu_count()]))
+
+    extractor = YaafeMFCC(e=True, coefs=11, De=True, DDe=True, D=True, DD=True,
+                          backend=backend)
+
+    directory = tempfile.mkdtemp()
+    try:
+        paths = write_many(directory, n_files, duration)
+
+        reference = None
+        for n in n_jobs:
+            t = time.time()
+            for _, _, error in extractor.extract_many(
+                    paths, n_jobs=n, chunksize=chunksize):
+                if error is not None:
+                    raise error
+            elapsed = time.time() - t
+            reference = elapsed if reference is None else reference
+            print('{n:3d} jobs | {elapsed:.2f}s | {files:.1f} files/s '
+                  '| speed-up {speed:.2f}x'.format(
+                      n=n, elapsed=elapsed, files=n_files / elapsed,
+                      speed=reference / elapsed))
+    finally:
+        shutil.rmtree(directory)
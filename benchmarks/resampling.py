@@ -0,0 +1,115 @@
+#!/usr/bin/env python
+# encoding: utf-8
+
+# The MIT License (MIT)
+
+# Copyright (c) 2016 CNRS
+
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+# AUTHORS
+# Hervé BREDIN - http://herve.niderb.fr
+"""
+Benchmark polyphase resampling against FFT-based resampling
+
+Compares throughput (in audio-seconds per second) of
+  * `Resampler`, streaming one block at a time (as used by AudioReader),
+  * `scipy.signal.resample_poly`, whole signal at once,
+  * `scipy.signal.resample` (FFT-based), whole signal at once,
+and reports maximum absolute difference between streaming output and
+`resample_poly` output.
+
+Usage:
+  resampling [--duration=<seconds>] [--to=<rate>] [<from_rate>...]
+  resampling -h | --help
+
+Options:
+  --duration=<seconds>    Duration of synthetic audio [default: 600].
+  --to=<rate>             Target sample rate [default: 16000].
+  -h --help               Show this screen.
+"""
+
+from __future__ import print_function
+
+import time
+
+import numpy as np
+import scipy.signal
+from docopt import docopt
+
+from pyannote.features.audio.reader import CHUNK_SIZE
+from pyannote.features.audio.reader import Resampler
+
+from benchmarks.synthetic import generate
+
+FROM_RATES = [8000, 11025, 22050, 44100, 48000]
+
+
+def stream(samples, from_rate, to_rate):
+    resampler = Resampler(from_rate, to_rate)
+    n_samples = len(samples)
+    resampled = []
+    for i in range(0, n_samples, CHUNK_SIZE):
+        final = i + CHUNK_SIZE >= n_samples
+        resampled.append(
+            resampler.process(samples[i:i + CHUNK_SIZE], final=final))
+    return np.concatenate(resampled)
+
+
+def poly(samples, from_rate, to_rate):
+    return scipy.signal.resample_poly(samples, to_rate, from_rate)
+
+
+def fft(samples, from_rate, to_rate):
+    n_samples = -(-len(samples) * to_rate // from_rate)
+    return scipy.signal.resample(samples, n_samples)
+
+
+def timeit(func, *args):
+    t = time.time()
+    output = func(*args)
+    return output, time.time() - t
+
+
+if __name__ == '__main__':
+
+    arguments = docopt(__doc__)
+    duration = float(arguments['--duration'])
+    to_rate = int(arguments['--to'])
+    from_rates = [int(r) for r in arguments['<from_rate>']] or FROM_RATES
+
+    for from_rate in from_rates:
+
+        samples = generate(duration, sample_rate=from_rate)
+        samples = samples.astype(np.float64) / 2 ** 15
+
+        # first run includes filter design (cached for subsequent runs)
+        stream(samples[:from_rate], from_rate, to_rate)
+
+        streamed, t_stream = timeit(stream, samples, from_rate, to_rate)
+        reference, t_poly = timeit(poly, samples, from_rate, to_rate)
+        _, t_fft = timeit(fft, samples, from_rate, to_rate)
+
+        print('{from_rate:>6d} > {to_rate:d} | streaming {stream:8.0f}x | '
+              'resample_poly {poly:8.0f}x | resample (FFT) {fft:8.0f}x | '
+              'max abs diff {diff:.1e}'.format(
+                  from_rate=from_rate, to_rate=to_rate,
+                  stream=duration / t_stream, poly=duration / t_poly,
+                  fft=duration / t_fft,
+                  diff=np.max(np.abs(streamed - reference))))
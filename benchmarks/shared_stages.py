@@ -0,0 +1,135 @@
+#!/usr/bin/env python
+# encoding: utf-8
+
+# The MIT License (MIT)
+
+# Copyright (c) 2016 CNRS
+
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+# AUTHORS
+# Hervé BREDIN - http://herve.niderb.fr
+"""
+Benchmark sharing of elementary stages (framing, FFT, mel filterbank) between
+features of a compound extractor (NumPy backend).
+
+Separate mode processes each feature with its own engine (i.e. its own
+framing, FFT and mel filterbank), shared mode processes all features with a
+single engine.
+
+Usage:
+  shared_stages [--duration=<seconds>] [--repeat=<N>]
+  shared_stages -h | --help
+
+Options:
+  --duration=<seconds>    Duration of synthetic audio [default: 600.0].
+  --repeat=<N>            Number of runs (best one is reported) [default: 3].
+  -h --help               Show this screen.
+"""
+
+from __future__ import print_function
+
+import time
+
+import numpy as np
+from docopt import docopt
+
+from pyannote.features.audio.numpy_backend import NumpyEngine
+from pyannote.features.audio.yaafe import YaafeMFCC
+from pyannote.features.applications import SpeechActivityDetectionFeatures
+
+from benchmarks.synthetic import SAMPLE_RATE, generate
+
+
+class CountingEngine(NumpyEngine):
+    """NumpyEngine counting the number of FFT'ed frames"""
+
+    n_fft = 0
+
+    def _spectrum(self, frames, window):
+        self.n_fft += len(frames)
+        return super(CountingEngine, self)._spectrum(frames, window)
+
+
+def two_mfcc():
+    """Definition of two MFCC (11 and 19 coefficients, with derivatives)"""
+    definition = []
+    for coefs in [11, 19]:
+        mfcc = YaafeMFCC(e=True, coefs=coefs, De=True, D=True)
+        definition.extend(
+            ('{name}_{coefs:d}'.format(name=name, coefs=coefs), recipe)
+            for name, recipe in mfcc.definition())
+    return definition
+
+
+DEFINITIONS = {
+    'sad': lambda: SpeechActivityDetectionFeatures().definition(),
+    '2 x mfcc': two_mfcc,
+}
+
+
+def run(definition, audio, repeat, shared=True):
+    """Return best processing time and number of FFT'ed frames"""
+
+    if shared:
+        definitions = [definition]
+    else:
+        definitions = [[feature] for feature in definition]
+
+    engines = []
+    for d in definitions:
+        engine = CountingEngine(sample_rate=SAMPLE_RATE)
+        engine.load(d)
+        engines.append(engine)
+
+    elapsed = []
+    for _ in range(repeat):
+        for engine in engines:
+            engine.n_fft = 0
+        t = time.time()
+        for engine in engines:
+            engine.processAudio(audio)
+        elapsed.append(time.time() - t)
+
+    return min(elapsed), sum(engine.n_fft for engine in engines)
+
+
+if __name__ == '__main__':
+
+    arguments = docopt(__doc__)
+    duration = float(arguments['--duration'])
+    repeat = int(arguments['--repeat'])
+
+    audio = generate(duration).astype(np.float64).reshape(1, -1)
+
+    for name, definition in sorted(DEFINITIONS.items()):
+
+        results = {}
+        for mode, shared in [('separate', False), ('shared', True)]:
+            results[mode] = run(definition(), audio, repeat, shared=shared)
+            print('{name:>8s} | {mode:>8s} | {elapsed:.3f}s | '
+                  '{n_fft:d} FFT frames'.format(
+                      name=name, mode=mode, elapsed=results[mode][0],
+                      n_fft=results[mode][1]))
+
+        print('{name:>8s} | speed-up: {speed:.2f}x | FFT work: {fft:.2f}x '
+              'less'.format(
+                  name=name,
+                  speed=results['separate'][0] / results['shared'][0],
+                  fft=1. * results['separate'][1] / results['shared'][1]))
@@ -0,0 +1,425 @@
+#!/usr/bin/env python
+# encoding: utf-8
+
+# The MIT License (MIT)
+
+# Copyright (c) 2016 CNRS
+
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+# AUTHORS
+# Hervé BREDIN - http://herve.niderb.fr
+"""
+Benchmark suite for audio feature extraction
+
+Measures throughput, latency and peak memory of all extractors (and of
+scripts/mfcc.py) on synthetic audio, and saves results as JSON. Comparing
+with a baseline JSON (e.g. obtained on another commit) reports regressions
+and exits with status 1 when any is found.
+
+Usage:
+  suite [options] [<case>...]
+  suite -h | --help
+
+Options:
+  --duration=<seconds>    Duration of synthetic audio [default: 60.0].
+  --sample-rate=<Hz>      Sample rate of synthetic audio [default: 16000].
+  --channels=<N>          Number of channels of synthetic audio [default: 1].
+  --repeat=<N>            Number of timed runs per case [default: 5].
+  --backend=<name>        Use "yaafe" or "numpy" backend [default: numpy].
+  --files=<N>             Number of files processed by CLI case [default: 4].
+  --output=<results>      Save results to JSON file <results>.
+  --compare=<baseline>    Compare with results in JSON file <baseline>.
+  --tolerance=<ratio>     Report regressions when throughput drops (or peak
+                          memory grows) by more than <ratio> [default: 0.1].
+  -h --help               Show this screen.
+
+Cases are "zcr", "mfcc" (with all combinations of derivatives, e.g.
+"mfcc+De+DD"), "compound", "sad" and "cli". Only run cases whose name starts
+with one of <case> when provided.
+"""
+
+from __future__ import print_function
+
+import datetime
+import itertools
+import json
+import os
+import platform
+import subprocess
+import sys
+import time
+
+import numpy as np
+from docopt import docopt
+
+try:
+    import resource
+except ImportError:
+    # not available on Windows
+    resource = None
+
+try:
+    import tracemalloc
+except ImportError:
+    # not available on Python 2
+    tracemalloc = None
+
+from pyannote.features.audio.yaafe import YaafeCompound
+from pyannote.features.audio.yaafe import YaafeMFCC, YaafeZCR
+from pyannote.features.applications import SpeechActivityDetectionFeatures
+
+from benchmarks.synthetic import temporary_wav, temporary_wavs
+
+MFCC_SCRIPT = os.path.join(
+    os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+    'scripts', 'mfcc.py')
+
+DERIVATIVES = ['De', 'D', 'DDe', 'DD']
+
+
+def extractors(sample_rate=16000, backend='numpy'):
+    """Iterate over (name, extractor) benchmark cases"""
+
+    yield 'zcr', YaafeZCR(sample_rate=sample_rate, backend=backend)
+
+    for flags in itertools.product([False, True], repeat=len(DERIVATIVES)):
+        derivatives = dict(zip(DERIVATIVES, flags))
+        name = '+'.join(['mfcc'] + [d for d in DERIVATIVES if derivatives[d]])
+        yield name, YaafeMFCC(sample_rate=sample_rate, e=True, coefs=11,
+                              backend=backend, **derivatives)
+
+    yield 'compound', YaafeCompound(
+        [YaafeZCR(sample_rate=sample_rate, backend=backend),
+         YaafeMFCC(sample_rate=sample_rate, e=True, coefs=11, D=True,
+                   backend=backend)],
+        sample_rate=sample_rate, backend=backend)
+
+    yield 'sad', SpeechActivityDetectionFeatures(
+        sample_rate=sample_rate, block_size=512, step_size=256,
+        backend=backend)
+
+
+def percentile(latencies, q):
+    return float(np.percentile(latencies, q))
+
+
+def rss_bytes(max_rss):
+    """Convert `ru_maxrss` to bytes (kilobytes on Linux, bytes on Mac OS X)"""
+    return max_rss if sys.platform == 'darwin' else max_rss * 1024
+
+
+def peak_memory(func):
+    """Peak memory allocated by func(), in bytes (None if unknown)
+
+    Relies on tracemalloc when available. Otherwise (e.g. on Python 2),
+    func() is run in a forked child process and the growth of its maximum
+    resident set size is reported instead.
+    """
+    if tracemalloc is None:
+        return forked_peak_memory(func)
+    tracemalloc.start()
+    try:
+        func()
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return peak
+
+
+def forked_peak_memory(func):
+    """Growth of maximum resident set size of a child process running func()
+
+    The forked child starts with the resident set size of its parent, which
+    is therefore subtracted. Returns None if unknown.
+    """
+    if resource is None or not hasattr(os, 'fork'):
+        return None
+
+    read, write = os.pipe()
+    pid = os.fork()
+
+    if pid == 0:
+        status = 1
+        try:
+            os.close(read)
+            start = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+            func()
+            stop = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+            os.write(write, '{0:d}'.format(stop - start).encode('ascii'))
+            status = 0
+        finally:
+            # never go back to the benchmark loop from the child process
+            os._exit(status)
+
+    os.close(write)
+    with os.fdopen(read, 'rb') as f:
+        output = f.read()
+    _, status = os.waitpid(pid, 0)
+    if status != 0 or not output:
+        return None
+    return rss_bytes(int(output))
+
+
+def command_max_rss(command):
+    """Maximum resident set size of a process running `command`, in bytes
+
+    Unlike RUSAGE_CHILDREN (which accumulates over all terminated children,
+    including those forked by `peak_memory`), only this process is measured.
+    Returns None if unknown.
+    """
+    if resource is None or not hasattr(os, 'wait4'):
+        return None
+    with open(os.devnull, 'w') as devnull:
+        process = subprocess.Popen(command, stdout=devnull)
+        _, status, rusage = os.wait4(process.pid, 0)
+    # process has been reaped already: do not let Popen wait for it
+    if os.WIFSIGNALED(status):
+        process.returncode = -os.WTERMSIG(status)
+    else:
+        process.returncode = os.WEXITSTATUS(status)
+    if process.returncode != 0:
+        raise subprocess.CalledProcessError(process.returncode, command)
+    return rss_bytes(rusage.ru_maxrss)
+
+
+def measure(name, func, duration, repeat, memory=peak_memory):
+    """Run func() once (warm-up) then `repeat` times and gather metrics
+
+    Parameters
+    ----------
+    name : str
+        Name of benchmark case.
+    func : callable
+        Processes `duration` seconds of audio.
+    duration : float
+        Duration of audio processed by func, in seconds.
+    repeat : int
+        Number of timed runs.
+    memory : callable, optional
+        memory(func) returns peak memory of func(), in bytes.
+        Defaults to `peak_memory`.
+    """
+
+    # warm-up (e.g. engine construction) is not part of latency
+    func()
+
+    latencies = []
+    for _ in range(repeat):
+        t = time.time()
+        func()
+        latencies.append(time.time() - t)
+
+    p50 = percentile(latencies, 50)
+    return {
+        'name': name,
+        'audio': duration,
+        'latency_p50': p50,
+        'latency_p95': percentile(latencies, 95),
+        'throughput': duration / p50 if p50 else None,
+        'peak_memory': memory(func),
+    }
+
+
+def run_extractors(names, duration, sample_rate, n_channels, repeat,
+                   backend):
+
+    with temporary_wav(duration, sample_rate=sample_rate,
+                       n_channels=n_channels) as path:
+
+        for name, extractor in extractors(sample_rate=sample_rate,
+                                          backend=backend):
+            if not selected(name, names):
+                continue
+            yield measure(name, lambda: extractor.extract(path),
+                          duration * n_channels, repeat)
+
+
+def run_cli(duration, sample_rate, n_channels, repeat, backend, n_files):
+
+    with temporary_wavs(n_files, duration, sample_rate=sample_rate,
+                        n_channels=n_channels) as paths:
+
+        directory = os.path.dirname(paths[0])
+        command = [sys.executable, MFCC_SCRIPT, '-e', '--De', '-D',
+                   '--DDe', '--DD', '--backend={0}'.format(backend),
+                   '--sample-rate={0:d}'.format(sample_rate), '--force',
+                   '--batch', os.path.join(directory, '*.wav'),
+                   os.path.join(directory, 'features')]
+        audio = n_files * duration * n_channels
+
+        with open(os.devnull, 'w') as devnull:
+            def func():
+                subprocess.check_call(command, stdout=devnull)
+
+            try:
+                # tracemalloc does not see what happens in the child process
+                result = measure('cli', func, audio, repeat,
+                                 memory=lambda _: command_max_rss(command))
+            except subprocess.CalledProcessError as e:
+                # record the failure rather than losing the other cases
+                return {'name': 'cli', 'audio': audio,
+                        'latency_p50': None, 'latency_p95': None,
+                        'throughput': None, 'peak_memory': None,
+                        'error': '{0}'.format(e)}
+
+    return result
+
+
+def selected(name, names):
+    return not names or any(name.startswith(n) for n in names)
+
+
+def git_commit():
+    """Current git commit (None if unknown)"""
+    directory = os.path.dirname(os.path.abspath(__file__))
+    try:
+        with open(os.devnull, 'w') as devnull:
+            commit = subprocess.check_output(
+                ['git', 'rev-parse', 'HEAD'], cwd=directory, stderr=devnull)
+    except (OSError, subprocess.CalledProcessError):
+        return None
+    return commit.decode('ascii').strip()
+
+
+def metadata(parameters):
+    return {
+        'commit': git_commit(),
+        'date': datetime.datetime.utcnow().isoformat(),
+        'python': platform.python_version(),
+        'numpy': np.__version__,
+        'platform': platform.platform(),
+        'parameters': parameters,
+    }
+
+
+def compare(results, baseline, tolerance):
+    """Compare results with baseline
+
+    Returns
+    -------
+    regressions : list
+        Names of cases whose throughput dropped (or peak memory grew) by
+        more than `tolerance`.
+    """
+
+    if results['parameters'] != baseline['parameters']:
+        print('WARNING: parameters differ from baseline ({0}).'.format(
+            baseline['parameters']))
+
+    reference = {case['name']: case for case in baseline['cases']}
+    regressions = []
+
+    print('{0:>20s} | {1:>18s} | {2:>18s}'.format(
+        'case', 'throughput', 'peak memory'))
+
+    for case in results['cases']:
+        before = reference.get(case['name'])
+        if before is None:
+            continue
+
+        ratios, status = [], ''
+        if case.get('error') and not before.get('error'):
+            status = 'FAILED'
+        for metric, worse in [('throughput', lambda r: r < 1. - tolerance),
+                              ('peak_memory', lambda r: r > 1. + tolerance)]:
+            if not case[metric] or not before[metric]:
+                ratios.append(None)
+                continue
+            ratio = 1. * case[metric] / before[metric]
+            ratios.append(ratio)
+            if worse(ratio):
+                status = 'REGRESSION'
+
+        if status:
+            regressions.append(case['name'])
+
+        print('{0:>20s} | {1:>18s} | {2:>18s} {3}'.format(
+            case['name'], *['-' if r is None else '{0:.2f}x'.format(r)
+                            for r in ratios] + [status]))
+
+    return regressions
+
+
+def report(case):
+    if case.get('error'):
+        print('{0:>20s} | failed: {1}'.format(case['name'], case['error']))
+        sys.stdout.flush()
+        return
+    memory = case['peak_memory']
+    print('{name:>20s} | {p50:9.3f}s | {p95:9.3f}s | {speed:>11s}x '
+          '| {memory:>10s}'.format(
+              name=case['name'], p50=case['latency_p50'],
+              p95=case['latency_p95'],
+              speed='-' if case['throughput'] is None
+              else '{0:.0f}'.format(case['throughput']),
+              memory='-' if memory is None
+              else '{0:.1f}MB'.format(memory / 2. ** 20)))
+    sys.stdout.flush()
+
+
+if __name__ == '__main__':
+
+    arguments = docopt(__doc__)
+    duration = float(arguments['--duration'])
+    sample_rate = int(arguments['--sample-rate'])
+    n_channels = int(arguments['--channels'])
+    repeat = int(arguments['--repeat'])
+    backend = arguments['--backend']
+    n_files = int(arguments['--files'])
+    tolerance = float(arguments['--tolerance'])
+    names = arguments['<case>']
+
+    parameters = {
+        'duration': duration,
+        'sample_rate': sample_rate,
+        'channels': n_channels,
+        'repeat': repeat,
+        'backend': backend,
+        'files': n_files,
+    }
+
+    print('{0:>20s} | {1:>10s} | {2:>10s} | {3:>12s} | {4:>10s}'.format(
+        'case', 'p50', 'p95', 'throughput', 'memory'))
+
+    cases = []
+    for case in run_extractors(names, duration, sample_rate, n_channels,
+                               repeat, backend):
+        cases.append(case)
+        report(case)
+
+    if selected('cli', names):
+        cases.append(run_cli(duration, sample_rate, n_channels, repeat,
+                             backend, n_files))
+        report(cases[-1])
+
+    results = dict(metadata(parameters), cases=cases)
+
+    if arguments['--output']:
+        with open(arguments['--output'], 'w') as f:
+            json.dump(results, f, indent=2, sort_keys=True)
+
+    if arguments['--compare']:
+        with open(arguments['--compare'], 'r') as f:
+            baseline = json.load(f)
+        regressions = compare(results, baseline, tolerance)
+        if regressions:
+            print('{0:d} regression(s): {1}'.format(
+                len(regressions), ', '.join(regressions)))
+            sys.exit(1)
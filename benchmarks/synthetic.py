@@ -0,0 +1,200 @@
+#!/usr/bin/env python
+# encoding: utf-8
+
+# The MIT License (MIT)
+
+# Copyright (c) 2016 CNRS
+
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+# AUTHORS
+# Hervé BREDIN - http://herve.niderb.fr
+"""Synthetic audio and text for benchmarks (no download needed)"""
+
+import contextlib
+import os
+import shutil
+import tempfile
+
+import numpy as np
+import scipy.io.wavfile
+
+SAMPLE_RATE = 16000
+SEED = 1234
+
+
+def generate(duration, sample_rate=SAMPLE_RATE, n_channels=1, seed=SEED):
+    """Generate synthetic (white noise) 16-bit audio
+
+    Parameters
+    ----------
+    duration : float
+        Duration in seconds.
+    sample_rate : int, optional
+        Defaults to 16000.
+    n_channels : int, optional
+        Defaults to 1.
+    seed : int, optional
+        Random seed. Same seed gives same audio.
+
+    Returns
+    -------
+    audio : numpy array
+        (n_samples, ) np.int16 array, or (n_samples, n_channels) for
+        multi-channel audio.
+    """
+    random = np.random.RandomState(seed)
+    n_samples = int(duration * sample_rate)
+    shape = (n_samples, ) if n_channels == 1 else (n_samples, n_channels)
+    return random.randint(-2 ** 12, 2 ** 12, size=shape).astype(np.int16)
+
+
+def write(path, duration, sample_rate=SAMPLE_RATE, n_channels=1, seed=SEED):
+    """Write synthetic audio to wav file `path` (see `generate`)"""
+    audio = generate(duration, sample_rate=sample_rate,
+                     n_channels=n_channels, seed=seed)
+    scipy.io.wavfile.write(path, sample_rate, audio)
+    return path
+
+
+def write_many(directory, n_files, duration, sample_rate=SAMPLE_RATE,
+               n_channels=1, seed=SEED):
+    """Write `n_files` synthetic wav files into `directory`
+
+    Returns
+    -------
+    paths : list
+        Paths to wav files (sorted).
+    """
+    return [write(os.path.join(directory, '{i:05d}.wav'.format(i=i)),
+                  duration, sample_rate=sample_rate, n_channels=n_channels,
+                  seed=seed + i)
+            for i in range(n_files)]
+
+
+@contextlib.contextmanager
+def temporary_wavs(n_files, duration, sample_rate=SAMPLE_RATE, n_channels=1,
+                   seed=SEED):
+    """Synthetic wav files, removed when leaving the context
+
+    Usage
+    -----
+    >>> with temporary_wavs(10, 60.) as paths:
+    ...     features = [extractor(path) for path in paths]
+    """
+    directory = tempfile.mkdtemp()
+    try:
+        yield write_many(directory, n_files, duration,
+                         sample_rate=sample_rate, n_channels=n_channels,
+                         seed=seed)
+    finally:
+        shutil.rmtree(directory)
+
+
+@contextlib.contextmanager
+def temporary_wav(duration, sample_rate=SAMPLE_RATE, n_channels=1,
+                  seed=SEED):
+    """Synthetic wav file, removed when leaving the context"""
+    with temporary_wavs(1, duration, sample_rate=sample_rate,
+                        n_channels=n_channels, seed=seed) as paths:
+        yield paths[0]
+
+
+# Penn Treebank tags of synthetic words (mostly nouns, as in real text)
+TAGS = ['NN'] * 4 + ['NNS', 'NNP', 'JJ', 'RB', 'VB', 'VBD', 'VBZ', 'DT', 'IN',
+                     'CC', 'PRP', 'CD']
+
+
+def generate_documents(n_documents, length=100, n_words=10000, seed=SEED):
+    """Generate synthetic text documents
+
+    Words are random lowercase strings drawn from a vocabulary of `n_words`
+    words with Zipfian (1 / rank) frequencies, as in natural language.
+
+    Parameters
+    ----------
+    n_documents : int
+        Number of documents.
+    length : int, optional
+        Number of words per document. Defaults to 100.
+    n_words : int, optional
+        Size of vocabulary. Defaults to 10000.
+    seed : int, optional
+        Random seed. Same seed gives same documents.
+
+    Returns
+    -------
+    documents : list
+        List of `n_documents` strings of `length` space-separated words.
+    vocabulary : list
+        Vocabulary, from most to least frequent word.
+    """
+
+    random = np.random.RandomState(seed)
+    letters = 'abcdefghijklmnopqrstuvwxyz'
+
+    vocabulary, seen = [], set()
+    while len(vocabulary) < n_words:
+        word = ''.join(letters[i] for i in
+                       random.randint(0, len(letters),
+                                      size=random.randint(2, 11)))
+        if word not in seen:
+            seen.add(word)
+            vocabulary.append(word)
+
+    p = 1. / np.arange(1, n_words + 1)
+    indices = random.choice(n_words, size=(n_documents, length), p=p / p.sum())
+    documents = [' '.join(vocabulary[i] for i in document)
+                 for document in indices]
+
+    return documents, vocabulary
+
+
+def has_nltk_data(resource):
+    """Whether NLTK `resource` (e.g. 'corpora/wordnet') has been downloaded"""
+    import nltk
+    try:
+        nltk.data.find(resource)
+    except LookupError:
+        return False
+    return True
+
+
+class SyntheticTagger(object):
+    """POS tagger for synthetic documents
+
+    Assigns a fixed random Penn Treebank tag to each word, at a (low) cost
+    independent of NLTK tagger models (which need to be downloaded).
+
+    Parameters
+    ----------
+    vocabulary : list
+        Vocabulary of synthetic documents (see `generate_documents`).
+    seed : int, optional
+        Random seed.
+    """
+
+    def __init__(self, vocabulary, seed=SEED):
+        super(SyntheticTagger, self).__init__()
+        random = np.random.RandomState(seed)
+        self.tags = {word: TAGS[i] for word, i in zip(
+            vocabulary, random.randint(0, len(TAGS), size=len(vocabulary)))}
+
+    def __call__(self, tokens):
+        return [(token, self.tags.get(token, 'NN')) for token in tokens]
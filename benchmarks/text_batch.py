@@ -0,0 +1,88 @@
+#!/usr/bin/env python
+# encoding: utf-8
+
+# The MIT License (MIT)
+
+# Copyright (c) 2016 CNRS
+
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+# AUTHORS
+# Hervé BREDIN - http://herve.niderb.fr
+"""
+Benchmark batch pre-processing (TextPreProcessing.batch) against document
+by document pre-processing on a synthetic corpus.
+
+Uses NLTK POS tagger (requires NLTK averaged perceptron tagger model), or
+synthetic tagger with --synthetic option. WordNet lemmatization is only
+benchmarked when NLTK WordNet corpus is available.
+
+Usage:
+  text_batch [--documents=<N>] [--length=<N>] [--synthetic]
+  text_batch -h | --help
+
+Options:
+  --documents=<N>         Number of synthetic documents [default: 10000].
+  --length=<N>            Number of words per document [default: 100].
+  --synthetic             Use synthetic POS tagger instead of NLTK's.
+  -h --help               Show this screen.
+"""
+
+from __future__ import print_function
+
+import time
+
+from docopt import docopt
+
+from pyannote.features.text.preprocessing import TextPreProcessing
+
+from benchmarks.synthetic import SyntheticTagger, generate_documents
+from benchmarks.synthetic import has_nltk_data
+
+
+if __name__ == '__main__':
+
+    arguments = docopt(__doc__)
+    n_documents = int(arguments['--documents'])
+    length = int(arguments['--length'])
+
+    documents, vocabulary = generate_documents(n_documents, length=length)
+    pos_tag = SyntheticTagger(vocabulary) if arguments['--synthetic'] \
+        else True
+
+    preprocessing = TextPreProcessing(
+        stopwords=vocabulary[:179], pos_tag=pos_tag,
+        lemmatize=has_nltk_data('corpora/wordnet'))
+
+    t = time.time()
+    reference = [preprocessing(d) for d in documents]
+    elapsed = time.time() - t
+    print('per document | {elapsed:.3f}s | {speed:.0f} documents/s'.format(
+        elapsed=elapsed, speed=n_documents / elapsed))
+
+    # same lemmatization and stemming cache state for both runs
+    preprocessing.cache_clear()
+
+    t = time.time()
+    processed = preprocessing.batch(documents)
+    elapsed_batch = time.time() - t
+    print('       batch | {elapsed:.3f}s | {speed:.0f} documents/s | '
+          'speed-up {speed_up:.2f}x | same output: {same}'.format(
+              elapsed=elapsed_batch, speed=n_documents / elapsed_batch,
+              speed_up=elapsed / elapsed_batch, same=processed == reference))
@@ -0,0 +1,94 @@
+#!/usr/bin/env python
+# encoding: utf-8
+
+# The MIT License (MIT)
+
+# Copyright (c) 2016 CNRS
+
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+# AUTHORS
+# Hervé BREDIN - http://herve.niderb.fr
+"""
+Benchmark memoized lemmatization and stemming of TextPreProcessing on a
+synthetic (Zipfian) corpus, with and without cache.
+
+WordNet lemmatization is only benchmarked when NLTK WordNet corpus is
+available (stemming only otherwise).
+
+Usage:
+  text_cache [--documents=<N>] [--length=<N>] [--words=<N>] [<cache_size>...]
+  text_cache -h | --help
+
+Options:
+  --documents=<N>         Number of synthetic documents [default: 10000].
+  --length=<N>            Number of words per document [default: 100].
+  --words=<N>             Size of vocabulary [default: 10000].
+  -h --help               Show this screen.
+"""
+
+from __future__ import print_function
+
+import time
+
+from docopt import docopt
+
+from pyannote.features.text.preprocessing import TextPreProcessing
+
+from benchmarks.synthetic import SyntheticTagger, generate_documents
+from benchmarks.synthetic import has_nltk_data
+
+
+if __name__ == '__main__':
+
+    arguments = docopt(__doc__)
+    n_documents = int(arguments['--documents'])
+    length = int(arguments['--length'])
+    n_words = int(arguments['--words'])
+    cache_sizes = [int(c) for c in arguments['<cache_size>']] or \
+        [0, 1000, 100000]
+
+    documents, vocabulary = generate_documents(
+        n_documents, length=length, n_words=n_words)
+    tagger = SyntheticTagger(vocabulary)
+    lemmatize = has_nltk_data('corpora/wordnet')
+
+    reference = None
+    for cache_size in cache_sizes:
+        preprocessing = TextPreProcessing(
+            stopwords=False, pos_tag=tagger, keep_pos=False,
+            lemmatize=lemmatize, cache_size=cache_size)
+
+        t = time.time()
+        processed = [preprocessing(d) for d in documents]
+        elapsed = time.time() - t
+
+        if reference is None:
+            reference = processed
+        assert processed == reference
+
+        info = preprocessing.cache_info()
+        print('cache size {size:>7d} | {elapsed:.3f}s | {speed:.0f} '
+              'documents/s | hit rate {rate:.1%}'.format(
+                  size=cache_size, elapsed=elapsed,
+                  speed=n_documents / elapsed,
+                  rate=1. * info.hits / max(1, info.hits + info.misses)))
+
+    if not lemmatize:
+        print('NLTK WordNet corpus is not available: stemming only.')
@@ -0,0 +1,110 @@
+#!/usr/bin/env python
+# encoding: utf-8
+
+# The MIT License (MIT)
+
+# Copyright (c) 2016 CNRS
+
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+# AUTHORS
+# Hervé BREDIN - http://herve.niderb.fr
+"""
+Benchmark stopword and POS filtering of TextPreProcessing on a synthetic
+corpus: list-based stopword lookup and per-token POS mapping (legacy) vs.
+hashed stopword lookup and precomputed POS tag sets.
+
+Usage:
+  text_filtering [--documents=<N>] [--length=<N>] [--stopwords=<N>]
+  text_filtering -h | --help
+
+Options:
+  --documents=<N>         Number of synthetic documents [default: 10000].
+  --length=<N>            Number of words per document [default: 100].
+  --stopwords=<N>         Number of stopwords (most frequent words, as many
+                          as NLTK English stopwords by default) [default: 179].
+  -h --help               Show this screen.
+"""
+
+from __future__ import print_function
+
+import time
+
+from docopt import docopt
+
+from pyannote.features.text.preprocessing import TextPreProcessing
+from pyannote.features.text.preprocessing import POS_INV_MAPPING
+
+from benchmarks.synthetic import SyntheticTagger, generate_documents
+
+
+def legacy(preprocessing, pos_tagged):
+    stopwords = list(preprocessing.stopwords)
+    keep_pos = set(preprocessing.keep_pos)
+    for tagged in pos_tagged:
+        stopworded = [(word, tag) for word, tag in tagged
+                      if word not in stopwords]
+        [(word, tag) for word, tag in stopworded
+         if POS_INV_MAPPING.get(tag, None) in keep_pos]
+
+
+def hashed(preprocessing, pos_tagged):
+    stopwords = preprocessing._stopwords
+    tags, keep_tags = preprocessing._tags, preprocessing._keep_tags
+    for tagged in pos_tagged:
+        stopworded = [(word, tag) for word, tag in tagged
+                      if word not in stopwords]
+        [(word, tag) for word, tag in stopworded
+         if (tag in tags) == keep_tags]
+
+
+def timeit(func, *args):
+    t = time.time()
+    func(*args)
+    return time.time() - t
+
+
+if __name__ == '__main__':
+
+    arguments = docopt(__doc__)
+    n_documents = int(arguments['--documents'])
+    length = int(arguments['--length'])
+    n_stopwords = int(arguments['--stopwords'])
+
+    documents, vocabulary = generate_documents(n_documents, length=length)
+    tagger = SyntheticTagger(vocabulary)
+
+    # lemmatization and stemming are left out to focus on filtering
+    preprocessing = TextPreProcessing(
+        stopwords=vocabulary[:n_stopwords], pos_tag=tagger,
+        lemmatize=False, stem=False)
+
+    pos_tagged = [tagger(preprocessing.tokenize(d)) for d in documents]
+
+    n_tokens = n_documents * length
+    for name, func in [('legacy', legacy), ('hashed', hashed)]:
+        elapsed = timeit(func, preprocessing, pos_tagged)
+        print('{name:>6s} | filtering {elapsed:.3f}s | {speed:.0f} '
+              'tokens/s'.format(name=name, elapsed=elapsed,
+                                speed=n_tokens / elapsed))
+
+    elapsed = timeit(lambda: [preprocessing(d) for d in documents])
+    print('end-to-end (synthetic tagger, no lemmatization nor stemming) | '
+          '{elapsed:.3f}s | {speed:.0f} documents/s'.format(
+              elapsed=elapsed, speed=n_documents / elapsed))
@@ -0,0 +1,90 @@
+#!/usr/bin/env python
+# encoding: utf-8
+
+# The MIT License (MIT)
+
+# Copyright (c) 2016 CNRS
+
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+# AUTHORS
+# Hervé BREDIN - http://herve.niderb.fr
+"""
+Benchmark parallel text pre-processing (TextPreProcessing.batch) over a
+synthetic corpus.
+
+Uses NLTK POS tagger (requires NLTK averaged perceptron tagger model), or
+synthetic tagger with --synthetic option. WordNet lemmatization is only
+applied when NLTK WordNet corpus is available.
+
+Usage:
+  text_parallel [--documents=<N>] [--length=<N>] [--synthetic] [<n_jobs>...]
+  text_parallel -h | --help
+
+Options:
+  --documents=<N>         Number of synthetic documents [default: 100000].
+  --length=<N>            Number of words per document [default: 100].
+  --synthetic             Use synthetic POS tagger instead of NLTK's.
+  -h --help               Show this screen.
+"""
+
+from __future__ import print_function
+
+import multiprocessing
+import time
+
+from docopt import docopt
+
+from pyannote.features.text.preprocessing import TextPreProcessing
+
+from benchmarks.synthetic import SyntheticTagger, generate_documents
+from benchmarks.synthetic import has_nltk_data
+
+
+if __name__ == '__main__':
+
+    arguments = docopt(__doc__)
+    n_documents = int(arguments['--documents'])
+    length = int(arguments['--length'])
+    n_jobs = [int(n) for n in arguments['<n_jobs>']]
+    if not n_jobs:
+        n_jobs = sorted(set([1, 2, 4, multiprocessing.cpu_count()]))
+
+    documents, vocabulary = generate_documents(n_documents, length=length)
+    pos_tag = SyntheticTagger(vocabulary) if arguments['--synthetic'] \
+        else True
+
+    reference, elapsed_1 = None, None
+    for n in n_jobs:
+
+        preprocessing = TextPreProcessing(
+            stopwords=vocabulary[:179], pos_tag=pos_tag,
+            lemmatize=has_nltk_data('corpora/wordnet'))
+
+        t = time.time()
+        processed = preprocessing.batch(documents, n_jobs=n)
+        elapsed = time.time() - t
+
+        if reference is None:
+            reference, elapsed_1 = processed, elapsed
+
+        print('{n:3d} jobs | {elapsed:.2f}s | {speed:.0f} documents/s '
+              '| speed-up {speed_up:.2f}x | same output: {same}'.format(
+                  n=n, elapsed=elapsed, speed=n_documents / elapsed,
+                  speed_up=elapsed_1 / elapsed, same=processed == reference))
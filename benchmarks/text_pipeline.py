@@ -0,0 +1,113 @@
+#!/usr/bin/env python
+# encoding: utf-8
+
+# The MIT License (MIT)
+
+# Copyright (c) 2016 CNRS
+
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+# AUTHORS
+# Hervé BREDIN - http://herve.niderb.fr
+"""
+Benchmark TextPreProcessing configurations on a synthetic corpus
+
+Only needed stages are run: POS-tagging, in particular, is skipped when
+neither POS filtering nor lemmatization is requested. Time spent tagging
+documents is reported for comparison.
+
+Uses NLTK POS tagger (requires NLTK averaged perceptron tagger model), or
+synthetic tagger with --synthetic option. Configurations with WordNet
+lemmatization are only benchmarked when NLTK WordNet corpus is available.
+
+Usage:
+  text_pipeline [--documents=<N>] [--length=<N>] [--synthetic]
+  text_pipeline -h | --help
+
+Options:
+  --documents=<N>         Number of synthetic documents [default: 10000].
+  --length=<N>            Number of words per document [default: 100].
+  --synthetic             Use synthetic POS tagger instead of NLTK's.
+  -h --help               Show this screen.
+"""
+
+from __future__ import print_function
+
+import time
+
+from docopt import docopt
+
+from pyannote.features.text.preprocessing import TextPreProcessing
+
+from benchmarks.synthetic import SyntheticTagger, generate_documents
+from benchmarks.synthetic import has_nltk_data
+
+CONFIGURATIONS = [
+    ('default', {}),
+    ('no lemmatization', {'lemmatize': False}),
+    ('no POS filtering', {'keep_pos': False}),
+    ('stopwords + stemming', {'keep_pos': False, 'lemmatize': False}),
+    ('stemming only', {'keep_pos': False, 'lemmatize': False,
+                       'stopwords': False}),
+    ('tokenization only', {'keep_pos': False, 'lemmatize': False,
+                           'stopwords': False, 'stem': False}),
+]
+
+
+def timeit(func):
+    t = time.time()
+    func()
+    return time.time() - t
+
+
+if __name__ == '__main__':
+
+    arguments = docopt(__doc__)
+    n_documents = int(arguments['--documents'])
+    length = int(arguments['--length'])
+
+    documents, vocabulary = generate_documents(n_documents, length=length)
+    pos_tag = SyntheticTagger(vocabulary) if arguments['--synthetic'] \
+        else True
+    wordnet = has_nltk_data('corpora/wordnet')
+
+    for name, configuration in CONFIGURATIONS:
+
+        if configuration.get('lemmatize', True) and not wordnet:
+            print('{name:>20s} | skipped (NLTK WordNet corpus is not '
+                  'available)'.format(name=name))
+            continue
+
+        parameters = {'stopwords': vocabulary[:179], 'pos_tag': pos_tag}
+        parameters.update(configuration)
+        preprocessing = TextPreProcessing(**parameters)
+        elapsed = timeit(lambda: preprocessing.batch(documents))
+        print('{name:>20s} | {elapsed:.3f}s | {speed:.0f} documents/s | '
+              'POS-tagging: {tagging}'.format(
+                  name=name, elapsed=elapsed, speed=n_documents / elapsed,
+                  tagging='yes' if preprocessing._pos_tagging else 'no'))
+
+    # tokenization only (and nothing else) + POS-tagging
+    preprocessing = TextPreProcessing(
+        pos_tag=pos_tag, stopwords=False, lemmatize=False, stem=False,
+        keep_pos={None}, min_length=0)
+    elapsed = timeit(lambda: preprocessing.batch(documents))
+    print('{name:>20s} | {elapsed:.3f}s | {speed:.0f} documents/s'.format(
+        name='tokenization + POS', elapsed=elapsed,
+        speed=n_documents / elapsed))
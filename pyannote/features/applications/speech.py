@@ -28,13 +28,18 @@
 
 from __future__ import unicode_literals
 
+import numpy as np
+
 from ..audio.yaafe import YaafeCompound, YaafeZCR, YaafeMFCC
+from ..audio.yaafe import BACKEND_YAAFE
 
 
 class SpeechActivityDetectionFeatures(YaafeCompound):
     """Features for speech activity detection"""
 
-    def __init__(self, sample_rate=16000, block_size=512, step_size=256):
+    def __init__(self, sample_rate=16000, block_size=512, step_size=256,
+                 backend=BACKEND_YAAFE, resample=False, downmix=False,
+                 dtype=np.float64):
 
         extractors = [
             YaafeZCR(
@@ -51,4 +56,6 @@ class SpeechActivityDetectionFeatures(YaafeCompound):
         super(SpeechActivityDetectionFeatures, self).__init__(
             extractors,
             sample_rate=sample_rate,
-            block_size=block_size, step_size=step_size)
+            block_size=block_size, step_size=step_size,
+            backend=backend, resample=resample, downmix=downmix,
+            dtype=dtype)
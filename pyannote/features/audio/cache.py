@@ -0,0 +1,206 @@
+#!/usr/bin/env python
+# encoding: utf-8
+
+# The MIT License (MIT)
+
+# Copyright (c) 2016 CNRS
+
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+# AUTHORS
+# Hervé BREDIN - http://herve.niderb.fr
+
+from __future__ import unicode_literals
+
+import hashlib
+import json
+import os
+import pickle
+import tempfile
+
+
+class FeatureCache(object):
+    """Content-addressed on-disk feature cache
+
+    Features are stored as pickled `SlidingWindowFeature` and indexed by
+    audio file (content or path, modification time and size) and extractor
+    (sample rate, backend, resampling, downmix, dtype, definition and kept
+    columns).
+
+    Writes are atomic (write to temporary file then rename), so that the
+    cache can safely be shared by concurrent processes (e.g. workers of
+    `YaafeFeatureExtractor.extract_many`).
+
+    Parameters
+    ----------
+    root : string
+        Path to cache directory (created if needed).
+    max_size : int, optional
+        Maximum cache size, in bytes. When exceeded, least recently used
+        entries are removed. Defaults to no limit.
+    hash_content : boolean, optional
+        Identify audio files by their content (SHA1) rather than by their
+        path, modification time and size. Slower, but robust to files being
+        moved or touched. Defaults to False.
+
+    Usage
+    -----
+    >>> cache = FeatureCache('/path/to/cache', max_size=10 * 2 ** 30)
+    >>> features = cache(extractor, 'audio.wav')
+    """
+
+    def __init__(self, root, max_size=None, hash_content=False):
+        super(FeatureCache, self).__init__()
+        self.root = root
+        self.max_size = max_size
+        self.hash_content = hash_content
+        # estimated cache size (lazily computed)
+        self._size = None
+
+        if not os.path.isdir(self.root):
+            try:
+                os.makedirs(self.root)
+            except OSError:
+                # created in the meantime by a concurrent process
+                if not os.path.isdir(self.root):
+                    raise
+
+    def _audio_key(self, wav):
+
+        if not self.hash_content:
+            stat = os.stat(wav)
+            return [os.path.abspath(wav), stat.st_mtime, stat.st_size]
+
+        sha1 = hashlib.sha1()
+        with open(wav, 'rb') as f:
+            for block in iter(lambda: f.read(2 ** 20), b''):
+                sha1.update(block)
+        return sha1.hexdigest()
+
+    def key(self, extractor, wav):
+        """Cache key for features extracted by `extractor` from `wav`"""
+
+        material = {
+            'audio': self._audio_key(wav),
+            'sample_rate': extractor.sample_rate,
+            'backend': extractor.backend,
+            'resample': extractor.resample,
+            'downmix': extractor.downmix,
+            'dtype': extractor.dtype.name,
+            'definition': extractor.definition(),
+            'columns': sorted(extractor.columns().items()),
+        }
+        material = json.dumps(material, sort_keys=True)
+        return hashlib.sha1(material.encode('utf-8')).hexdigest()
+
+    def _path(self, key):
+        return os.path.join(self.root, key[:2], key + '.pkl')
+
+    def get(self, extractor, wav):
+        """Get cached features (None if not cached)"""
+
+        path = self._path(self.key(extractor, wav))
+
+        try:
+            with open(path, 'rb') as f:
+                features = pickle.load(f)
+        except (IOError, OSError, EOFError, pickle.UnpicklingError):
+            return None
+
+        # mark entry as recently used
+        try:
+            os.utime(path, None)
+        except OSError:
+            pass
+
+        return features
+
+    def set(self, extractor, wav, features):
+        """Store features in cache"""
+
+        path = self._path(self.key(extractor, wav))
+        directory = os.path.dirname(path)
+        if not os.path.isdir(directory):
+            try:
+                os.makedirs(directory)
+            except OSError:
+                if not os.path.isdir(directory):
+                    raise
+
+        # atomic write: concurrent readers either see nothing or everything
+        f = tempfile.NamedTemporaryFile(dir=directory, suffix='.tmp',
+                                        delete=False)
+        try:
+            with f:
+                pickle.dump(features, f, protocol=pickle.HIGHEST_PROTOCOL)
+            os.rename(f.name, path)
+        finally:
+            if os.path.exists(f.name):
+                os.remove(f.name)
+
+        if self.max_size is not None:
+            if self._size is None:
+                self._size = self.size()
+            else:
+                self._size += os.path.getsize(path)
+            if self._size > self.max_size:
+                self.evict()
+
+    def __call__(self, extractor, wav):
+        """Get features from cache, or extract (and cache) them"""
+
+        features = self.get(extractor, wav)
+        if features is None:
+            features = extractor.extract(wav)
+            self.set(extractor, wav, features)
+        return features
+
+    def _entries(self):
+        for directory, _, files in os.walk(self.root):
+            for name in files:
+                if not name.endswith('.pkl'):
+                    continue
+                path = os.path.join(directory, name)
+                try:
+                    stat = os.stat(path)
+                except OSError:
+                    continue
+                yield path, stat.st_mtime, stat.st_size
+
+    def size(self):
+        """Total size of cached features, in bytes"""
+        return sum(size for _, _, size in self._entries())
+
+    def evict(self):
+        """Remove least recently used entries until cache fits `max_size`"""
+
+        entries = sorted(self._entries(), key=lambda entry: entry[1])
+        size = sum(entry[2] for entry in entries)
+
+        for path, _, entry_size in entries:
+            if size <= self.max_size:
+                break
+            try:
+                os.remove(path)
+            except OSError:
+                # already removed by a concurrent process
+                pass
+            size -= entry_size
+
+        self._size = size
@@ -0,0 +1,677 @@
+#!/usr/bin/env python
+# encoding: utf-8
+
+# The MIT License (MIT)
+
+# Copyright (c) 2016 CNRS
+
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+# AUTHORS
+# Hervé BREDIN - http://herve.niderb.fr
+
+"""Pure NumPy implementation of the Yaafe features used by pyannote
+
+This backend interprets the very same recipes as `yaafelib` (as returned by
+`YaafeFeatureExtractor.definition()`) and produces one row per `YaafeFrame`.
+
+Supported recipes are of the form:
+
+    "MFCC [param=value ...] [> Derivate [param=value ...]]"
+    "ZCR [param=value ...] [> Derivate [param=value ...]]"
+
+Processing chain follows Yaafe's:
+
+    * frames are centered on sample `i x stepSize` (the first one being
+      zero-padded on its left half, see `YaafeFrame`) and there are
+      ceil(n_samples / stepSize) of them;
+    * MFCC = Hanning window > |FFT| > triangular mel filterbank > log > DCT;
+    * ZCR = number of sign changes divided by block size;
+    * Derivate = linear regression over DO1Len (then DO2Len for order 2)
+      frames on each side, with edge frames repeated at both ends.
+
+Framing and derivation are implemented as streaming stages (see `Framer` and
+`Derivative`) so that audio can be processed chunk by chunk with the very same
+output as when processed at once.
+
+Multi-channel audio is processed in one pass, channels being an extra axis of
+every stage: features are then (n_frames, n_channels, dimension) arrays.
+
+Computation is carried out in float64 by default. float32 computation (see
+`NumpyEngine` dtype parameter) halves memory and bandwidth at the cost of
+precision: every stage, FFT included (see `_rfft_magnitude`), is then
+carried out in float32. Run benchmarks/dtype.py for accuracy and throughput
+comparison.
+
+This backend is NOT a verified replacement for `yaafelib`: frames are the
+same, but values have never been compared with `yaafelib` outputs. `RTOL`
+and `ATOL` are placeholders until they are set from the errors measured
+against reference `yaafelib` outputs, and the following conventions are
+assumptions about Yaafe's (any of them may shift values well beyond `RTOL`):
+
+    * mel filters are triangles of unit height (no area normalization);
+    * DCT is orthonormal DCT-II;
+    * Hanning window is symmetric (`np.hanning`);
+    * ZCR counts a crossing whenever the sign bit changes (i.e. going from 0
+      to a negative value is a crossing).
+
+Reference outputs are saved on a host with `yaafelib` with
+
+    $ python -m benchmarks.backends --save-reference --duration=2.0
+
+and this backend is checked against them (reporting the errors from which
+`RTOL` and `ATOL` are to be set) with
+
+    $ python -m benchmarks.backends --check-reference
+
+Until then, feature extractors warn whenever they use this backend.
+"""
+
+from __future__ import unicode_literals
+
+import numpy as np
+import scipy.fftpack
+from numpy.lib.stride_tricks import as_strided
+
+# tolerance with respect to yaafelib (placeholders, not measured yet)
+RTOL = 1e-3
+ATOL = 1e-3
+
+# smallest value passed to log in Cepstrum step
+EPSILON = 1e-10
+
+# Yaafe default parameters
+DEFAULTS = {
+    'MFCC': {
+        'blockSize': 1024, 'stepSize': 512,
+        'CepsIgnoreFirstCoeff': 1, 'CepsNbCoeffs': 13,
+        'FFTWindow': 'Hanning',
+        'MelMinFreq': 130.0, 'MelMaxFreq': 6854.0, 'MelNbFilters': 40,
+    },
+    'ZCR': {
+        'blockSize': 1024, 'stepSize': 512,
+    },
+    'Derivate': {
+        'DOrder': 1, 'DO1Len': 4, 'DO2Len': 1,
+    },
+}
+
+
+def _parse_value(value):
+    for type_ in (int, float):
+        try:
+            return type_(value)
+        except ValueError:
+            pass
+    return value
+
+
+def parse(recipe):
+    """Parse Yaafe recipe
+
+    Parameters
+    ----------
+    recipe : str
+        e.g. "MFCC blockSize=512 stepSize=256 > Derivate DOrder=1"
+
+    Returns
+    -------
+    steps : list
+        List of (name, params) tuples, where `params` is a dictionary
+        completed with Yaafe default values.
+        e.g. [('MFCC', {'blockSize': 512, ...}), ('Derivate', {...})]
+    """
+
+    steps = []
+    for step in recipe.split('>'):
+        tokens = step.split()
+        name = tokens[0]
+        if name not in DEFAULTS:
+            raise ValueError(
+                'Unsupported Yaafe feature "{name}".'.format(name=name))
+        params = dict(DEFAULTS[name])
+        for token in tokens[1:]:
+            key, value = token.split('=')
+            if key not in params:
+                raise ValueError(
+                    'Unsupported parameter "{key}" for "{name}".'.format(
+                        key=key, name=name))
+            params[key] = _parse_value(value)
+        steps.append((name, params))
+
+    if any(name != 'Derivate' for name, _ in steps[1:]):
+        raise ValueError(
+            'Unsupported Yaafe recipe "{recipe}".'.format(recipe=recipe))
+
+    return steps
+
+
+def dimension(recipe):
+    """Dimension of feature described by Yaafe `recipe`"""
+    feature, params = parse(recipe)[0]
+    if feature == 'MFCC':
+        return params['CepsNbCoeffs']
+    return 1
+
+
+class Framer(object):
+    """Streaming splitter of signal into (centered) Yaafe frames
+
+    Parameters
+    ----------
+    block_size, step_size : int
+
+    Usage
+    -----
+    >>> framer = Framer(block_size=512, step_size=256)
+    >>> for samples in chunks:
+    ...     frames = framer.process(samples)
+    >>> frames = framer.process(last_samples, final=True)
+
+    Frame i (covering samples [i x step_size - block_size / 2, ...[) is
+    returned as soon as all its samples are available, or, for the last
+    ones, when `final` is True (zero-padding the end of the signal).
+
+    Samples may have extra (e.g. channel) dimensions after the first one.
+    """
+
+    def __init__(self, block_size, step_size):
+        super(Framer, self).__init__()
+        self.block_size = block_size
+        self.step_size = step_size
+        self.reset()
+
+    def reset(self):
+        # first frame is centered on first sample (see process)
+        self._buffer = None
+        self._n_samples = 0
+        self._n_frames = 0
+
+    @property
+    def delay(self):
+        """Number of samples needed after a frame center to output it"""
+        return self.block_size - self.block_size // 2
+
+    def process(self, samples, final=False):
+        """Return (n_frames, block_size, ...) read-only view on frames"""
+
+        if self._buffer is None:
+            self._buffer = np.zeros(
+                (self.block_size // 2, ) + samples.shape[1:],
+                dtype=samples.dtype)
+        buffer = np.concatenate([self._buffer, samples], axis=0)
+        self._n_samples += len(samples)
+
+        if final:
+            total = (self._n_samples + self.step_size - 1) // self.step_size
+            n_frames = total - self._n_frames
+            size = (n_frames - 1) * self.step_size + self.block_size
+            if n_frames > 0 and len(buffer) < size:
+                padding = np.zeros((size - len(buffer), ) + buffer.shape[1:],
+                                   dtype=buffer.dtype)
+                buffer = np.concatenate([buffer, padding], axis=0)
+        elif len(buffer) < self.block_size:
+            n_frames = 0
+        else:
+            n_frames = (len(buffer) - self.block_size) // self.step_size + 1
+
+        stride = buffer.strides[0]
+        frames = as_strided(
+            buffer, shape=(n_frames, self.block_size) + buffer.shape[1:],
+            strides=(self.step_size * stride, stride) + buffer.strides[1:])
+        frames.flags.writeable = False
+
+        self._buffer = buffer[n_frames * self.step_size:]
+        self._n_frames += n_frames
+
+        if final:
+            self.reset()
+
+        return frames
+
+
+def frame(signal, block_size, step_size):
+    """Split signal into (centered) Yaafe frames
+
+    Parameters
+    ----------
+    signal : (n_samples, ) numpy array
+    block_size, step_size : int
+
+    Returns
+    -------
+    frames : (n_frames, block_size) numpy array
+        Read-only strided view on a zero-padded copy of `signal`, with
+        n_frames = ceil(n_samples / step_size).
+    """
+    framer = Framer(block_size, step_size)
+    return framer.process(signal, final=True)
+
+
+def window(name, block_size):
+    if name != 'Hanning':
+        raise ValueError(
+            'Unsupported FFT window "{name}".'.format(name=name))
+    return np.hanning(block_size)
+
+
+def mel_filterbank(sample_rate, block_size,
+                   min_freq=130.0, max_freq=6854.0, n_filters=40):
+    """Triangular mel filterbank
+
+    Returns
+    -------
+    filterbank : (block_size / 2 + 1, n_filters) numpy array
+        Magnitude spectrum (row) x filterbank = mel energies (row)
+    """
+
+    def hz2mel(f):
+        return 1127.0 * np.log(1. + f / 700.)
+
+    def mel2hz(m):
+        return 700. * (np.exp(m / 1127.0) - 1.)
+
+    # filter edges & centers
+    edges = mel2hz(np.linspace(hz2mel(min_freq), hz2mel(max_freq),
+                               num=n_filters + 2))
+    lower, center, upper = edges[:-2], edges[1:-1], edges[2:]
+
+    # FFT bin frequencies
+    freq = np.arange(block_size // 2 + 1) * 1. * sample_rate / block_size
+    freq = freq.reshape(-1, 1)
+
+    rising = (freq - lower) / (center - lower)
+    falling = (upper - freq) / (upper - center)
+    return np.maximum(0., np.minimum(rising, falling))
+
+
+def dct_matrix(n_filters, first, n_coefs):
+    """Orthonormal DCT-II matrix restricted to coefficients [first, first+n)
+
+    Returns
+    -------
+    dct : (n_filters, n_coefs) numpy array
+        Log mel energies (row) x dct = cepstral coefficients (row)
+    """
+
+    k = np.arange(first, first + n_coefs).reshape(1, -1)
+    n = np.arange(n_filters).reshape(-1, 1)
+    dct = np.sqrt(2. / n_filters) * np.cos(np.pi * k * (n + 0.5) / n_filters)
+    dct[:, k[0] == 0] /= np.sqrt(2.)
+    return dct
+
+
+class Derivative(object):
+    """Streaming regression-based derivative (along first axis)
+
+    Parameters
+    ----------
+    length : int
+        Number of frames used on each side. Edge frames are repeated at both
+        ends of the stream.
+
+    Derivative of frame t is returned as soon as frame t + length is
+    available, or, for the last ones, when `final` is True.
+    """
+
+    def __init__(self, length):
+        super(Derivative, self).__init__()
+        self.length = length
+        self._norm = 2. * sum(k * k for k in range(1, length + 1))
+        self.reset()
+
+    def reset(self):
+        self._buffer = None
+
+    def process(self, data, final=False):
+
+        length = self.length
+
+        if self._buffer is None:
+            if len(data) == 0:
+                return np.array(data)
+            self._buffer = np.repeat(data[:1], length, axis=0)
+
+        buffer = np.concatenate([self._buffer, data], axis=0)
+        if final:
+            buffer = np.concatenate(
+                [buffer, np.repeat(buffer[-1:], length, axis=0)], axis=0)
+
+        n_frames = max(0, len(buffer) - 2 * length)
+        derivative = np.zeros((n_frames, ) + buffer.shape[1:],
+                              dtype=buffer.dtype)
+        for k in range(1, length + 1):
+            derivative += k * (buffer[length + k:length + k + n_frames] -
+                               buffer[length - k:length - k + n_frames])
+        derivative /= self._norm
+
+        self._buffer = buffer[n_frames:]
+
+        if final:
+            self.reset()
+
+        return derivative
+
+
+def derivate(data, length):
+    """Regression-based derivative (along first axis)
+
+    Parameters
+    ----------
+    data : (n_frames, dimension) numpy array
+    length : int
+        Number of frames used on each side.
+    """
+    return Derivative(length).process(data, final=True)
+
+
+def _rfft_magnitude(frames):
+    """Magnitude of real FFT of `frames` along their second axis
+
+    Same as np.abs(np.fft.rfft(frames, axis=1)), but computed in the type of
+    `frames` (i.e. also in float32) using scipy.fftpack.
+    """
+
+    # [y(0), Re(y(1)), Im(y(1)), ..., Re(y(n/2))] for even n
+    packed = scipy.fftpack.rfft(frames, axis=1)
+    n = frames.shape[1]
+
+    magnitude = np.empty((len(frames), n // 2 + 1) + frames.shape[2:],
+                         dtype=packed.dtype)
+    magnitude[:, 0] = np.abs(packed[:, 0])
+    if n % 2 == 0:
+        magnitude[:, -1] = np.abs(packed[:, -1])
+
+    # (real, imaginary) pairs in between
+    n_pairs = (n - 1) // 2
+    pairs = packed[:, 1:1 + 2 * n_pairs].reshape(
+        (len(frames), n_pairs, 2) + frames.shape[2:])
+    magnitude[:, 1:1 + n_pairs] = np.hypot(pairs[:, :, 0], pairs[:, :, 1])
+    return magnitude
+
+
+class _Stage(object):
+    """Stateless processing stage (frame-wise function)"""
+
+    def __init__(self, func):
+        super(_Stage, self).__init__()
+        self.func = func
+
+    def reset(self):
+        pass
+
+    def process(self, data, final=False):
+        return self.func(data)
+
+
+class NumpyEngine(object):
+    """NumPy engine with the same interface as `yaafelib.Engine`
+
+    Values are not verified against `yaafelib` (see module docstring).
+
+    Parameters
+    ----------
+    sample_rate : int, optional
+        Defaults to 16000.
+    dtype : numpy dtype, optional
+        Floating point type used for computation (np.float32 or np.float64).
+        Defaults to np.float64.
+
+    Usage
+    -----
+    >>> engine = NumpyEngine(sample_rate=16000)
+    >>> engine.load([('zcr', 'ZCR blockSize=512 stepSize=256')])
+    >>> features = engine.processAudio(audio)
+    >>> features['zcr']
+
+    Audio can also be streamed, in which case outputs are made available as
+    soon as possible (and the remaining ones when flushing the engine):
+
+    >>> engine.reset()
+    >>> for samples in chunks:
+    ...     engine.writeInput('audio', samples)
+    ...     engine.process()
+    ...     features = engine.readAllOutputs()
+    >>> engine.flush()
+    >>> features = engine.readAllOutputs()
+
+    Notes
+    -----
+    Recipes are split into elementary stages (framing, spectrum, mel
+    filterbank, cepstrum, derivatives) forming a graph in which stages
+    shared by several recipes are only computed once: e.g. ZCR and MFCC
+    share framing, MFCC with different numbers of coefficients share
+    everything but the DCT, derivatives are applied to the very same static
+    coefficients, and second order derivatives to first order ones.
+    """
+
+    def __init__(self, sample_rate=16000, dtype=np.float64):
+        super(NumpyEngine, self).__init__()
+        self.sample_rate = sample_rate
+        self.dtype = np.dtype(dtype)
+        self._recipes = []
+        self._stages = {}
+        self.reset()
+
+    def load(self, definition):
+        """Load feature definition
+
+        Parameters
+        ----------
+        definition : list
+            List of (name, recipe) tuples.
+        """
+
+        self._recipes = []
+        self._stages = {}
+
+        for name, recipe in definition:
+
+            steps = parse(recipe)
+
+            # feature extraction stages (framing, spectrum, etc.)
+            feature, params = steps[0]
+            stages = self._feature(feature, params)
+
+            # derivation steps (DOrder=2 is DO1Len then DO2Len regression)
+            for _, params in steps[1:]:
+                lengths = [params['DO1Len'], params['DO2Len']]
+                for length in lengths[:params['DOrder']]:
+                    stages.append((('Derivate', length),
+                                   lambda length=length: Derivative(length)))
+
+            prefix = ()
+            for key, stage in stages:
+                prefix = prefix + (key, )
+                if prefix not in self._stages:
+                    self._stages[prefix] = stage()
+
+            self._recipes.append((name, prefix))
+
+        self.reset()
+
+    def _feature(self, feature, params):
+        """Elementary stages of `feature` extraction
+
+        Returns
+        -------
+        stages : list
+            List of (key, factory) tuples. Features whose chains start with
+            the same keys (e.g. MFCC with different numbers of coefficients,
+            or ZCR and MFCC with the same block and step sizes) share the
+            corresponding stages.
+        """
+
+        block_size = params['blockSize']
+        step_size = params['stepSize']
+
+        stages = [(('Frame', block_size, step_size),
+                   lambda: Framer(block_size, step_size))]
+
+        if feature == 'ZCR':
+            stages.append((('ZCR', ), lambda: _Stage(self._zcr)))
+
+        elif feature == 'MFCC':
+
+            def spectrum():
+                hanning = window(params['FFTWindow'], block_size)
+                hanning = hanning.astype(self.dtype)
+                return _Stage(lambda frames: self._spectrum(frames, hanning))
+
+            def log_mel():
+                filterbank = mel_filterbank(
+                    self.sample_rate, block_size,
+                    min_freq=params['MelMinFreq'],
+                    max_freq=params['MelMaxFreq'],
+                    n_filters=params['MelNbFilters']).astype(self.dtype)
+                return _Stage(
+                    lambda spectrum: self._log_mel(spectrum, filterbank))
+
+            def cepstrum():
+                dct = dct_matrix(
+                    params['MelNbFilters'],
+                    params['CepsIgnoreFirstCoeff'],
+                    params['CepsNbCoeffs']).astype(self.dtype)
+                return _Stage(lambda log_mel: self._cepstrum(log_mel, dct))
+
+            stages.append((('Spectrum', params['FFTWindow']), spectrum))
+            stages.append((('MelFilterbank', params['MelMinFreq'],
+                            params['MelMaxFreq'], params['MelNbFilters']),
+                           log_mel))
+            stages.append((('Cepstrum', params['CepsIgnoreFirstCoeff'],
+                            params['CepsNbCoeffs']), cepstrum))
+
+        return stages
+
+    # np.einsum (unlike BLAS-based np.dot) gives the very same result for a
+    # frame whatever the number of frames processed at once: streamed features
+    # are therefore identical to batch ones.
+
+    def _spectrum(self, frames, window):
+        window = window.reshape((-1, ) + (1, ) * (frames.ndim - 2))
+        frames = frames * window
+        if self.dtype == np.float32:
+            # np.fft computes in float64 (before numpy 2.0) whatever the
+            # input type, while scipy.fftpack preserves float32
+            return _rfft_magnitude(frames)
+        return np.abs(np.fft.rfft(frames, axis=1)).astype(self.dtype,
+                                                          copy=False)
+
+    def _log_mel(self, spectrum, filterbank):
+        energies = np.einsum('ij...,jk->i...k', spectrum, filterbank)
+        return np.log(np.maximum(energies, EPSILON))
+
+    def _cepstrum(self, log_mel, dct):
+        return np.einsum('...j,jk->...k', log_mel, dct)
+
+    def _zcr(self, frames):
+        signs = np.signbit(frames)
+        changes = np.count_nonzero(signs[:, 1:] != signs[:, :-1], axis=1)
+        zcr = (1. * changes / frames.shape[1]).astype(self.dtype)
+        return zcr[..., np.newaxis]
+
+    def reset(self):
+        """Reset engine state (e.g. before processing a new file)"""
+        for stage in self._stages.values():
+            stage.reset()
+        self._input = []
+        self._channels = ()
+        self._outputs = {name: [] for name, _ in self._recipes}
+
+    def writeInput(self, name, data):
+        """Append `data` to input `name`
+
+        Parameters
+        ----------
+        name : str
+            Must be 'audio'.
+        data : numpy array
+            (1, n_samples) mono audio or (n_channels, n_samples) multi-channel
+            audio (in which case features have an extra channel axis).
+        """
+        if name != 'audio':
+            raise ValueError('Unknown input "{name}".'.format(name=name))
+        data = np.asarray(data, dtype=self.dtype)
+        if data.ndim < 2 or data.shape[0] == 1:
+            data = data.reshape(-1)
+        else:
+            # samples along first axis, channels along second one
+            data = data.T
+        self._channels = data.shape[1:]
+        self._input.append(data)
+
+    def _run(self, final=False):
+
+        signal = np.concatenate(self._input, axis=0) if self._input \
+            else np.zeros((0, ) + self._channels, dtype=self.dtype)
+        self._input = []
+
+        # intermediate results, indexed by recipe prefix
+        computed = {}
+
+        for name, prefix in self._recipes:
+
+            for k in range(1, len(prefix) + 1):
+                if prefix[:k] in computed:
+                    continue
+                data = signal if k == 1 else computed[prefix[:k - 1]]
+                stage = self._stages[prefix[:k]]
+                computed[prefix[:k]] = stage.process(data, final=final)
+
+            self._outputs[name].append(computed[prefix])
+
+    def process(self):
+        """Process available input"""
+        self._run(final=False)
+
+    def flush(self):
+        """Process remaining input, assuming end of stream"""
+        self._run(final=True)
+
+    def readAllOutputs(self):
+        """Read (and consume) outputs available so far
+
+        Returns
+        -------
+        features : dict
+            (n_frames, dimension) numpy array indexed by feature name, or
+            (n_frames, n_channels, dimension) for multi-channel audio.
+        """
+        features = {name: np.concatenate(outputs, axis=0)
+                    for name, outputs in self._outputs.items() if outputs}
+        self._outputs = {name: [] for name, _ in self._recipes}
+        return features
+
+    def processAudio(self, audio):
+        """Extract features
+
+        Parameters
+        ----------
+        audio : (1, n_samples) or (n_channels, n_samples) numpy array
+
+        Returns
+        -------
+        features : dict
+            (n_frames, dimension) numpy array indexed by feature name
+        """
+        self.reset()
+        self.writeInput('audio', audio)
+        self.process()
+        self.flush()
+        return self.readAllOutputs()
@@ -0,0 +1,253 @@
+#!/usr/bin/env python
+# encoding: utf-8
+
+# The MIT License (MIT)
+
+# Copyright (c) 2016 CNRS
+
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+# AUTHORS
+# Hervé BREDIN - http://herve.niderb.fr
+
+"""Per-stage profiling of feature extraction
+
+Extraction of each file is split into the following stages:
+
+    * open: opening audio file (parsing header, memory-mapping samples)
+    * read: reading blocks of samples (and converting them to float)
+    * engine: building Yaafe engine (only when not cached)
+    * process: running the engine
+    * assemble: writing engine outputs into feature matrix
+
+>>> profiler = Profiler()
+>>> with profiler.attach(extractor):
+...     for wav in wavs:
+...         features = extractor(wav)
+>>> print(profiler.report())
+
+Profiling only covers extraction carried out in the current process (e.g. not
+in `extract_many` worker processes).
+"""
+
+from __future__ import unicode_literals
+
+import contextlib
+import time
+
+import numpy as np
+
+STAGES = ['open', 'read', 'engine', 'process', 'assemble']
+
+
+class _NullProfiler(object):
+    """Profiler that does not profile (used when profiling is disabled)"""
+
+    @contextlib.contextmanager
+    def stage(self, name, nbytes=0):
+        yield
+
+    def iterate(self, name, iterable):
+        return iterable
+
+    def add(self, name, elapsed, nbytes=0):
+        pass
+
+    def start(self):
+        pass
+
+    def stop(self, duration):
+        pass
+
+
+NULL_PROFILER = _NullProfiler()
+
+
+class Profiler(object):
+    """Per-stage timers and byte counters
+
+    Parameters
+    ----------
+    callback : callable, optional
+        Called with the record of each file once it has been processed.
+        A record is a dictionary with 'duration' (of audio, in seconds),
+        'elapsed' (wall time, in seconds) and 'stages' (dictionary of
+        (elapsed, nbytes) tuples indexed by stage name) keys.
+
+    Usage
+    -----
+    >>> profiler = Profiler()
+    >>> with profiler.attach(extractor):
+    ...     features = extractor('audio.wav')
+    >>> summary = profiler.summary()
+    """
+
+    def __init__(self, callback=None):
+        super(Profiler, self).__init__()
+        self.callback = callback
+        self.records = []
+        self._current = None
+
+    def reset(self):
+        """Forget all records"""
+        self.records = []
+        self._current = None
+
+    @contextlib.contextmanager
+    def attach(self, extractor):
+        """Profile `extractor` within this context"""
+        previous = extractor.profiler
+        extractor.profiler = self
+        try:
+            yield self
+        finally:
+            extractor.profiler = previous
+
+    def start(self):
+        """Start profiling a new file"""
+        self._current = {'start': time.time(),
+                         'stages': {name: [0., 0] for name in STAGES}}
+
+    def stop(self, duration):
+        """Stop profiling current file
+
+        Parameters
+        ----------
+        duration : float
+            Duration of processed audio, in seconds.
+        """
+
+        current, self._current = self._current, None
+        if current is None:
+            return
+
+        record = {
+            'duration': duration,
+            'elapsed': time.time() - current['start'],
+            'stages': {name: tuple(stats)
+                       for name, stats in current['stages'].items()},
+        }
+        self.records.append(record)
+
+        if self.callback is not None:
+            self.callback(record)
+
+    def add(self, name, elapsed, nbytes=0):
+        """Add `elapsed` seconds and `nbytes` bytes to stage `name`"""
+        if self._current is None:
+            return
+        stats = self._current['stages'].setdefault(name, [0., 0])
+        stats[0] += elapsed
+        stats[1] += nbytes
+
+    @contextlib.contextmanager
+    def stage(self, name, nbytes=0):
+        """Time the code run within this context as stage `name`"""
+        t = time.time()
+        try:
+            yield
+        finally:
+            self.add(name, time.time() - t, nbytes=nbytes)
+
+    def iterate(self, name, iterable):
+        """Time iteration over `iterable` (and count its bytes) as `name`"""
+        iterator = iter(iterable)
+        while True:
+            t = time.time()
+            try:
+                item = next(iterator)
+            except StopIteration:
+                self.add(name, time.time() - t)
+                return
+            self.add(name, time.time() - t,
+                     nbytes=getattr(item, 'nbytes', 0))
+            yield item
+
+    def summary(self):
+        """Aggregate statistics over all profiled files
+
+        Returns
+        -------
+        summary : dict
+            'n_files', 'duration' (total audio duration), 'elapsed' (total
+            wall time), 'speed' (audio seconds per wall second), 'p50' and
+            'p95' (per-file latency percentiles) and 'stages' (dictionary
+            of per-stage 'elapsed', 'share', 'p50', 'p95' and 'nbytes').
+        """
+
+        n_files = len(self.records)
+        duration = sum(r['duration'] for r in self.records)
+        elapsed = np.array([r['elapsed'] for r in self.records])
+        total = float(np.sum(elapsed))
+
+        def percentile(values, q):
+            return float(np.percentile(values, q)) if len(values) else 0.
+
+        names = list(STAGES)
+        for record in self.records:
+            names.extend(name for name in sorted(record['stages'])
+                         if name not in names)
+
+        stages = {}
+        for name in names:
+            times = np.array([r['stages'].get(name, (0., 0))[0]
+                              for r in self.records])
+            stages[name] = {
+                'elapsed': float(np.sum(times)),
+                'share': float(np.sum(times)) / total if total else 0.,
+                'p50': percentile(times, 50),
+                'p95': percentile(times, 95),
+                'nbytes': sum(r['stages'].get(name, (0., 0))[1]
+                              for r in self.records),
+            }
+
+        return {
+            'n_files': n_files,
+            'duration': duration,
+            'elapsed': total,
+            'speed': duration / total if total else 0.,
+            'p50': percentile(elapsed, 50),
+            'p95': percentile(elapsed, 95),
+            'stages': stages,
+        }
+
+    def report(self):
+        """Human-readable summary"""
+
+        summary = self.summary()
+
+        lines = [
+            '{n_files:d} files | {duration:.1f}s of audio in {elapsed:.2f}s '
+            '| {speed:.1f} audio-seconds/s | latency p50 {p50:.1f}ms '
+            'p95 {p95:.1f}ms'.format(
+                n_files=summary['n_files'], duration=summary['duration'],
+                elapsed=summary['elapsed'], speed=summary['speed'],
+                p50=1000 * summary['p50'], p95=1000 * summary['p95']),
+        ]
+
+        for name in STAGES + sorted(set(summary['stages']) - set(STAGES)):
+            stats = summary['stages'][name]
+            lines.append(
+                '{name:>8s} | {elapsed:7.2f}s | {share:5.1f}% | p50 '
+                '{p50:8.1f}ms | p95 {p95:8.1f}ms | {mb:9.1f}MB'.format(
+                    name=name, elapsed=stats['elapsed'],
+                    share=100 * stats['share'], p50=1000 * stats['p50'],
+                    p95=1000 * stats['p95'], mb=stats['nbytes'] / 2. ** 20))
+
+        return '\n'.join(lines)
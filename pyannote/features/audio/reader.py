@@ -0,0 +1,293 @@
+#!/usr/bin/env python
+# encoding: utf-8
+
+# The MIT License (MIT)
+
+# Copyright (c) 2016 CNRS
+
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+# AUTHORS
+# Hervé BREDIN - http://herve.niderb.fr
+
+from __future__ import unicode_literals
+
+import numpy as np
+import scipy.io.wavfile
+import scipy.signal
+
+try:
+    from math import gcd
+except ImportError:
+    from fractions import gcd
+
+# default number of samples per block (i.e. ~16 seconds at 16kHz)
+CHUNK_SIZE = 2 ** 18
+
+# resampling filters, indexed by (up, down) factors
+_RESAMPLING_FILTERS = {}
+
+
+def resampling_filter(up, down):
+    """Polyphase anti-aliasing filter
+
+    Designed (and zero-padded) the same way as `scipy.signal.resample_poly`
+    does, but only once per (up, down) pair.
+
+    Returns
+    -------
+    h : numpy array
+        FIR filter coefficients.
+    delay : int
+        Number of output samples to discard to compensate filter delay.
+    """
+
+    key = (up, down)
+    if key not in _RESAMPLING_FILTERS:
+
+        max_rate = max(up, down)
+        half_len = 10 * max_rate
+        h = up * scipy.signal.firwin(2 * half_len + 1, 1. / max_rate,
+                                     window=('kaiser', 5.0))
+
+        # zero-pad filter to put output samples at the center
+        n_pre_pad = down - half_len % down
+        h = np.concatenate([np.zeros((n_pre_pad, )), h])
+        delay = (half_len + n_pre_pad) // down
+
+        _RESAMPLING_FILTERS[key] = (h, delay)
+
+    return _RESAMPLING_FILTERS[key]
+
+
+class Resampler(object):
+    """Streaming polyphase resampler
+
+    Resampling a signal chunk by chunk gives the same output as resampling it
+    at once with `scipy.signal.resample_poly`. Multi-channel signals are
+    resampled along their first axis.
+
+    Parameters
+    ----------
+    from_rate, to_rate : int
+        Input and output sample rates.
+
+    Usage
+    -----
+    >>> resampler = Resampler(44100, 16000)
+    >>> for samples in chunks:
+    ...     resampled = resampler.process(samples)
+    >>> resampled = resampler.process(last_samples, final=True)
+    """
+
+    def __init__(self, from_rate, to_rate):
+        super(Resampler, self).__init__()
+        g = gcd(from_rate, to_rate)
+        self.up = to_rate // g
+        self.down = from_rate // g
+        self._h, self._delay = resampling_filter(self.up, self.down)
+        self.reset()
+
+    def reset(self):
+        self._buffer = None
+        # index of first buffered input sample (always a multiple of down)
+        self._start = 0
+        self._n_in = 0
+        self._n_out = 0
+
+    def _first_input(self, k):
+        """Index of first input sample contributing to output sample k"""
+        n = ((k + self._delay) * self.down - len(self._h) + 1)
+        return max(0, -(-n // self.up))
+
+    def _last_input(self, k):
+        """Index of last input sample contributing to output sample k"""
+        return ((k + self._delay) * self.down) // self.up
+
+    def process(self, samples, final=False):
+        """Return resampled samples available so far"""
+
+        up, down, delay = self.up, self.down, self._delay
+
+        samples = np.asarray(samples)
+        if self._buffer is None:
+            self._buffer = np.zeros((0, ) + samples.shape[1:])
+        buffer = np.concatenate([self._buffer, samples], axis=0)
+        self._n_in += len(samples)
+
+        if final:
+            n_out = -(-self._n_in * up // down)
+        else:
+            # outputs whose last contributing input sample has been received
+            n_out = max(0, -(-(self._n_in * up - delay * down) // down))
+
+        if n_out <= self._n_out:
+            self._buffer = buffer
+            if final:
+                self.reset()
+            return np.zeros((0, ) + samples.shape[1:], dtype=samples.dtype)
+
+        # inputs beyond the end of the signal are zeros
+        needed = self._last_input(n_out - 1) + 1 - self._start
+        if len(buffer) < needed:
+            padding = np.zeros((needed - len(buffer), ) + buffer.shape[1:])
+            buffer = np.concatenate([buffer, padding], axis=0)
+
+        y = scipy.signal.upfirdn(self._h, buffer[:needed], up, down, axis=0)
+        offset = delay - self._start * up // down
+        resampled = y[self._n_out + offset:n_out + offset]
+
+        # forget inputs that will no longer contribute
+        start = max(self._start, self._first_input(n_out) // down * down)
+        self._buffer = buffer[start - self._start:]
+        self._start = start
+        self._n_out = n_out
+
+        if final:
+            self.reset()
+
+        return resampled.astype(samples.dtype, copy=False)
+
+
+class AudioReader(object):
+    """Audio reader (memory-mapped wav files, file objects or numpy arrays)
+
+    Samples are not loaded into memory at once: they are converted to
+    floating point one block at a time (see `.blocks()`).
+
+    Parameters
+    ----------
+    wav : string, file object or numpy array
+        Path to wav file (memory-mapped), binary file object (e.g. BytesIO)
+        containing wav data, or in-memory (n_samples, ) array of samples.
+        In-memory arrays never go through the filesystem, and C-contiguous
+        arrays already in `dtype` are not even copied.
+    dtype : numpy dtype, optional
+        Floating point type of returned samples (np.float32 or np.float64).
+        Defaults to np.float64.
+    sample_rate : int, optional
+        Sample rate of in-memory `wav` array (mandatory in this case).
+    resample : int, optional
+        Resample audio to this sample rate (using polyphase filtering) if
+        needed. Defaults to keeping original sample rate.
+    downmix : bool, optional
+        Average multi-channel audio into one channel at read time. Defaults
+        to keeping all channels.
+
+    Usage
+    -----
+    >>> reader = AudioReader('audio.wav', dtype=np.float32)
+    >>> for block in reader.blocks(chunk_size=16000):
+    ...     # block is a (n_samples, ) np.float32 array
+    ...     # (or (n_samples, n_channels) for multi-channel audio)
+    """
+
+    def __init__(self, wav, dtype=np.float64, sample_rate=None,
+                 resample=None, downmix=False):
+        super(AudioReader, self).__init__()
+
+        if isinstance(wav, np.ndarray):
+            if sample_rate is None:
+                raise ValueError(
+                    'sample_rate must be provided for in-memory audio.')
+            data = wav
+
+        elif hasattr(wav, 'read'):
+            sample_rate, data = scipy.io.wavfile.read(wav)
+
+        else:
+            try:
+                sample_rate, data = scipy.io.wavfile.read(wav, mmap=True)
+            except ValueError:
+                # some formats (e.g. 24-bit PCM) cannot be memory-mapped
+                sample_rate, data = scipy.io.wavfile.read(wav)
+
+        self.dtype = np.dtype(dtype)
+        self.downmix = downmix
+        self._data = data
+
+        # sample rate of original samples (i.e. before resampling)
+        self.original_sample_rate = sample_rate
+
+        self._resampler = None
+        if resample is not None and resample != sample_rate:
+            self._resampler = Resampler(sample_rate, resample)
+            sample_rate = resample
+
+        self.sample_rate = sample_rate
+
+    @property
+    def n_samples(self):
+        """Number of samples (per channel)"""
+        n_samples = len(self._data)
+        if self._resampler is not None:
+            up, down = self._resampler.up, self._resampler.down
+            n_samples = -(-n_samples * up // down)
+        return n_samples
+
+    @property
+    def n_channels(self):
+        """Number of channels (after downmix, if any)"""
+        if self.downmix or self._data.ndim < 2:
+            return 1
+        return self._data.shape[1]
+
+    @property
+    def duration(self):
+        """Duration in seconds"""
+        return 1. * self.n_samples / self.sample_rate
+
+    def blocks(self, chunk_size=CHUNK_SIZE):
+        """Iterate over consecutive blocks of samples
+
+        Parameters
+        ----------
+        chunk_size : int, optional
+            Number of (original) samples per block. Defaults to `CHUNK_SIZE`.
+
+        Yields
+        ------
+        block : numpy array
+            C-contiguous (n_samples, ) block of samples, in `dtype`, or
+            (n_samples, n_channels) for multi-channel audio.
+        """
+
+        n_samples = len(self._data)
+        for i in range(0, n_samples, chunk_size):
+            block = self._convert(self._data[i:i + chunk_size])
+            if self._resampler is not None:
+                final = i + chunk_size >= n_samples
+                block = self._resampler.process(block, final=final)
+            yield block
+
+    def _convert(self, samples):
+        """Convert raw samples to C-contiguous `dtype` (downmixed) array"""
+        if self.downmix and samples.ndim > 1:
+            samples = np.mean(samples, axis=1, dtype=self.dtype)
+        samples = np.ascontiguousarray(samples, dtype=self.dtype)
+        if self.n_channels == 1:
+            samples = samples.reshape(-1)
+        return samples
+
+    def read(self):
+        """Read all samples at once (same shape and dtype as blocks)"""
+        data = self._convert(self._data)
+        if self._resampler is not None:
+            data = self._resampler.process(data, final=True)
+        return data
@@ -0,0 +1,379 @@
+#!/usr/bin/env python
+# encoding: utf-8
+
+# The MIT License (MIT)
+
+# Copyright (c) 2016 CNRS
+
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+# AUTHORS
+# Hervé BREDIN - http://herve.niderb.fr
+
+"""Feature storage
+
+HDF5 feature store
+------------------
+
+Many files worth of features can be stored in one single HDF5 container,
+along with their sliding window (and `YaafeFrame` parameters) and the
+definition of the extractor that was used.
+
+Features are chunked along time (and optionally compressed) so that
+reading the features of a segment only reads (and decompresses) the
+chunks that cover it:
+
+>>> with FeatureStore('features.h5', mode='a') as store:
+...     store.write('file1', extractor.extract('file1.wav'), extractor)
+>>> with FeatureStore('features.h5', mode='r') as store:
+...     features = store.crop('file1', Segment(3600., 3610.))
+
+Requires `h5py`.
+
+Lazy loading
+------------
+
+Features can also be loaded lazily, either from a feature store or from
+numpy files (saved with `save_npy`): data is then memory-mapped (or read
+from HDF5 chunks) only when accessed, so that many files can be kept "open"
+at once while memory usage remains bounded by what is actually read.
+
+>>> features = store.load('file1')
+>>> save_npy('file1.npy', features, extractor=extractor)
+>>> features = load_npy('file1.npy')
+>>> data = features.crop(Segment(3600., 3610.))
+"""
+
+from __future__ import unicode_literals
+
+import json
+import os.path
+
+import numpy as np
+from pyannote.core.feature import SlidingWindowFeature
+from pyannote.core.segment import SlidingWindow
+
+from .yaafe import YaafeFrame, _float_frame_ranges
+
+try:
+    import h5py
+except ImportError:
+    h5py = None
+
+# default number of frames per chunk
+CHUNK_SIZE = 1024
+
+
+class LazySlidingWindowFeature(SlidingWindowFeature):
+    """SlidingWindowFeature backed by memory-mapped (or HDF5) data
+
+    Parameters
+    ----------
+    data : numpy.memmap or h5py.Dataset
+    sliding_window : SlidingWindow
+    """
+
+    def crop(self, focus, mode='loose', fixed=None):
+        """Read frames selected by `focus`
+
+        Frames are the very same as returned by `SlidingWindowFeature.crop`
+        but only the (contiguous) ranges of frames covering `focus` are
+        read. Use `FeatureStore.crop` to get frames with exact half-open
+        boundaries instead.
+
+        Returns
+        -------
+        data : numpy array
+        """
+
+        indices = self.sliding_window.crop(focus, mode=mode, fixed=fixed)
+        indices = np.asarray(indices, dtype=np.int64)
+
+        n = len(self.data)
+        if mode == 'center' and fixed is not None:
+            # same as np.take(..., mode='clip') in SlidingWindowFeature.crop
+            indices = np.clip(indices, 0, max(0, n - 1))
+        else:
+            indices = indices[(indices > -1) & (indices < n)]
+
+        if len(indices) == 0 or n == 0:
+            return np.zeros((0, ) + self.data.shape[1:],
+                            dtype=self.data.dtype)
+
+        # read each contiguous range of needed frames (Timeline focus may
+        # select several of them)
+        needed = np.unique(indices)
+        ranges = np.split(needed, np.where(np.diff(needed) != 1)[0] + 1)
+        data = np.concatenate([np.asarray(self.data[r[0]:r[-1] + 1])
+                               for r in ranges])
+
+        return data[np.searchsorted(needed, indices)]
+
+
+def _get_metadata(sliding_window, extractor=None):
+    """Serializable description of sliding window (and extractor)"""
+
+    metadata = {
+        'start': sliding_window.start,
+        'duration': sliding_window.duration,
+        'step': sliding_window.step,
+    }
+
+    # Yaafe parameters of frames unpickled from older files are unknown
+    if isinstance(sliding_window, YaafeFrame) and \
+            sliding_window.blockSize is not None:
+        metadata['blockSize'] = sliding_window.blockSize
+        metadata['stepSize'] = sliding_window.stepSize
+        metadata['sampleRate'] = sliding_window.sampleRate
+
+    if extractor is not None:
+        metadata['definition'] = json.dumps(extractor.definition())
+        metadata['columns'] = json.dumps(sorted(extractor.columns().items()))
+
+    return metadata
+
+
+def _get_sliding_window(metadata):
+
+    if 'blockSize' in metadata:
+        return YaafeFrame(blockSize=int(metadata['blockSize']),
+                          stepSize=int(metadata['stepSize']),
+                          sampleRate=int(metadata['sampleRate']))
+
+    return SlidingWindow(start=float(metadata['start']),
+                         duration=float(metadata['duration']),
+                         step=float(metadata['step']))
+
+
+def save_npy(path, features, extractor=None):
+    """Save features as numpy file (with JSON metadata in `path`.json)
+
+    Parameters
+    ----------
+    path : string
+    features : SlidingWindowFeature
+    extractor : YaafeFeatureExtractor, optional
+        When provided, its definition is stored in metadata as well.
+    """
+
+    with open(path, 'wb') as f:
+        np.save(f, features.data)
+
+    metadata = _get_metadata(features.sliding_window, extractor=extractor)
+    with open(path + '.json', 'w') as f:
+        json.dump(metadata, f)
+
+
+def load_npy(path, sliding_window=None):
+    """Lazily load features saved as numpy file
+
+    Parameters
+    ----------
+    path : string
+    sliding_window : SlidingWindow, optional
+        Defaults to the one described in `path`.json metadata.
+
+    Returns
+    -------
+    features : LazySlidingWindowFeature
+        Memory-mapped features.
+    """
+
+    if sliding_window is None:
+        if not os.path.exists(path + '.json'):
+            raise ValueError(
+                'Missing metadata "{path}.json": '
+                'sliding_window must be provided.'.format(path=path))
+        with open(path + '.json', 'r') as f:
+            sliding_window = _get_sliding_window(json.load(f))
+
+    data = np.load(path, mmap_mode='r')
+    return LazySlidingWindowFeature(data, sliding_window)
+
+
+def _frame_ranges(sliding_window, segments, n_frames):
+    """Indices [first, last[ of frames overlapping each of `segments`"""
+
+    if isinstance(sliding_window, YaafeFrame):
+        # exact integer arithmetic
+        return sliding_window.segments_to_frame_ranges(
+            segments, n_frames=n_frames)
+
+    times = np.array([(segment.start, segment.end) for segment in segments],
+                     dtype=np.float64).reshape(-1, 2)
+    return _float_frame_ranges(sliding_window, times, n_frames=n_frames)
+
+
+class FeatureStore(object):
+    """HDF5 feature store
+
+    Parameters
+    ----------
+    path : string
+        Path to HDF5 file.
+    mode : {'r', 'a', 'w'}, optional
+        Read-only, read/write (create if needed) or create (truncate if
+        needed). Defaults to 'r'.
+    compression : {None, 'gzip', 'lzf'}, optional
+        Compression filter applied to newly written features.
+        Defaults to no compression.
+    chunk_size : int, optional
+        Number of frames per chunk. Defaults to `CHUNK_SIZE`.
+    """
+
+    def __init__(self, path, mode='r', compression=None,
+                 chunk_size=CHUNK_SIZE):
+
+        super(FeatureStore, self).__init__()
+
+        if h5py is None:
+            raise ImportError('FeatureStore requires h5py.')
+
+        self.path = path
+        self.compression = compression
+        self.chunk_size = chunk_size
+        self._file = h5py.File(path, mode)
+
+    def close(self):
+        self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.close()
+
+    def __contains__(self, uri):
+        return uri in self._file
+
+    def write(self, uri, features, extractor=None):
+        """Store features
+
+        Parameters
+        ----------
+        uri : string
+            Unique identifier (e.g. file basename). Existing features with
+            the same identifier are overwritten.
+        features : SlidingWindowFeature
+        extractor : YaafeFeatureExtractor, optional
+            When provided, its definition is stored as well.
+        """
+
+        data = features.data
+        sliding_window = features.sliding_window
+
+        if uri in self._file:
+            del self._file[uri]
+
+        chunks = None
+        if len(data) > 0:
+            chunks = (min(self.chunk_size, len(data)), ) + data.shape[1:]
+
+        dataset = self._file.create_dataset(
+            uri, data=data, chunks=chunks,
+            compression=self.compression,
+            shuffle=self.compression is not None)
+
+        metadata = _get_metadata(sliding_window, extractor=extractor)
+        for key, value in metadata.items():
+            dataset.attrs[key] = value
+
+    def __setitem__(self, uri, features):
+        self.write(uri, features)
+
+    def sliding_window(self, uri):
+        """Get sliding window of features `uri`"""
+
+        return _get_sliding_window(self._file[uri].attrs)
+
+    def definition(self, uri):
+        """Get definition of extractor used for features `uri` (or None)"""
+        attrs = self._file[uri].attrs
+        if 'definition' not in attrs:
+            return None
+        return [tuple(d) for d in json.loads(attrs['definition'])]
+
+    def __getitem__(self, uri):
+        """Read features `uri` entirely"""
+        dataset = self._file[uri]
+        return SlidingWindowFeature(dataset[()], self.sliding_window(uri))
+
+    def load(self, uri):
+        """Lazily load features `uri`
+
+        Returns
+        -------
+        features : LazySlidingWindowFeature
+            Features whose data is only read from disk when accessed
+            (as long as the store is open).
+        """
+        return LazySlidingWindowFeature(self._file[uri],
+                                        self.sliding_window(uri))
+
+    def crop(self, uri, segment):
+        """Read features `uri` overlapping `segment`
+
+        Only the chunks covering `segment` are read from disk. Unlike
+        `SlidingWindowFeature.crop`, frames that only touch `segment`
+        boundaries are not included.
+
+        Returns
+        -------
+        features : SlidingWindowFeature
+            Features of all frames overlapping `segment`.
+        """
+        return self.crop_many(uri, [segment])[0]
+
+    def crop_many(self, uri, segments):
+        """Read features `uri` overlapping each of `segments`
+
+        Frame ranges of all segments are computed at once.
+
+        Returns
+        -------
+        features : list of SlidingWindowFeature
+            Features of all frames overlapping each segment.
+        """
+
+        dataset = self._file[uri]
+        sliding_window = self.sliding_window(uri)
+
+        ranges = _frame_ranges(sliding_window, segments, len(dataset))
+
+        features = []
+        for first, last in ranges:
+            window = SlidingWindow(
+                start=sliding_window.start + first * sliding_window.step,
+                duration=sliding_window.duration,
+                step=sliding_window.step)
+            features.append(
+                SlidingWindowFeature(dataset[first:last], window))
+
+        return features
+
+    def __iter__(self):
+        """Iterate over stored uris"""
+        uris = []
+        self._file.visititems(
+            lambda name, item: uris.append(name)
+            if isinstance(item, h5py.Dataset) else None)
+        return iter(uris)
+
+    def __len__(self):
+        return sum(1 for _ in self)
@@ -29,12 +29,76 @@
 from __future__ import unicode_literals
 
 
-import scipy.io.wavfile
-import yaafelib
+import copy
+import multiprocessing
+import warnings
 from pyannote.core.feature import SlidingWindowFeature
 from pyannote.core.segment import SlidingWindow
 import numpy as np
 
+from .numpy_backend import NumpyEngine
+from .numpy_backend import dimension
+from .numpy_backend import parse
+from .profiling import NULL_PROFILER
+from .reader import AudioReader
+from .reader import Resampler
+
+try:
+    import yaafelib
+except ImportError:
+    yaafelib = None
+
+BACKEND_YAAFE = 'yaafe'
+BACKEND_NUMPY = 'numpy'
+
+# feature extractor (and feature cache) of current worker process
+# (see .extract_many)
+_worker_extractor = None
+_worker_cache = None
+
+
+def _initialize_worker(extractor, cache):
+    global _worker_extractor, _worker_cache
+    _worker_extractor = extractor
+    _worker_cache = cache
+
+
+def _extract(extractor, wav, cache=None):
+    try:
+        if cache is None:
+            features = extractor.extract(wav)
+        else:
+            features = cache(extractor, wav)
+        return wav, features, None
+    except Exception as e:
+        return wav, None, e
+
+
+def _extract_in_worker(wav):
+    return _extract(_worker_extractor, wav, cache=_worker_cache)
+
+
+def _float_frame_ranges(sliding_window, times, n_frames=None):
+    """Indices [first, last[ of frames overlapping (n, 2) `times` array
+
+    Float arithmetic, for any SlidingWindow.
+    """
+
+    start, duration, step = \
+        sliding_window.start, sliding_window.duration, sliding_window.step
+
+    first = np.floor((times[:, 0] - start - duration) / step).astype(
+        np.int64) + 1
+    last = np.ceil((times[:, 1] - start) / step).astype(np.int64)
+
+    first = np.maximum(0, first)
+    last = np.maximum(first, last)
+    if n_frames is not None:
+        first = np.minimum(first, n_frames)
+        last = np.minimum(last, n_frames)
+
+    return np.stack([first, last], axis=1)
+
 
 class YaafeFrame(SlidingWindow):
     """Yaafe frames
@@ -63,6 +127,210 @@ class YaafeFrame(SlidingWindow):
             duration=duration, step=step, start=start
         )
 
+        self.blockSize = blockSize
+        self.stepSize = stepSize
+        self.sampleRate = sampleRate
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        # frames pickled before Yaafe parameters were stored (e.g. features
+        # saved by older mfcc.py) only know their start, duration and step,
+        # from which Yaafe parameters cannot be told apart (e.g. 512 samples
+        # at 16kHz or 1024 samples at 32kHz): they are left unknown.
+        for name in ('blockSize', 'stepSize', 'sampleRate'):
+            self.__dict__.setdefault(name, None)
+
+    def _half_samples_to_frames(self, start, end):
+        # frame i covers [2 i stepSize - blockSize, 2 i stepSize + blockSize[
+        # in half samples (exact even when blockSize is odd)
+        first = (start - self.blockSize) // (2 * self.stepSize) + 1
+        last = -((-end - self.blockSize) // (2 * self.stepSize))
+        first = np.maximum(0, first)
+        last = np.maximum(first, last)
+        return first, last
+
+    def samples_to_frames(self, start, end):
+        """Indices of frames overlapping sample ranges
+
+        Parameters
+        ----------
+        start, end : int or numpy array of int
+            Sample ranges [start, end[.
+
+        Returns
+        -------
+        first, last : int or numpy array of int
+            Frames [first, last[ overlapping each sample range.
+
+        Raises
+        ------
+        ValueError
+            When Yaafe parameters are unknown (see `__setstate__`).
+        """
+        if self.sampleRate is None:
+            raise ValueError(
+                'Yaafe parameters of frames unpickled from older files are '
+                'unknown: sample ranges cannot be converted to frames.')
+        start = 2 * np.asarray(start, dtype=np.int64)
+        end = 2 * np.asarray(end, dtype=np.int64)
+        return self._half_samples_to_frames(start, end)
+
+    def segments_to_frame_ranges(self, segments, n_frames=None):
+        """Indices of frames overlapping segments
+
+        Times are converted to (half) samples once, then frame indices are
+        computed with exact integer arithmetic for all segments at once
+        (or with float arithmetic when Yaafe parameters are unknown, see
+        `__setstate__`).
+
+        Parameters
+        ----------
+        segments : iterable of Segment or (n_segments, 2) numpy array
+            Segments, or their start and end times (in seconds).
+        n_frames : int, optional
+            Total number of frames. When provided, ranges are clipped to
+            [0, n_frames].
+
+        Returns
+        -------
+        ranges : (n_segments, 2) numpy array of int
+            Frames [first, last[ overlapping each segment.
+        """
+
+        if not isinstance(segments, np.ndarray):
+            segments = [(segment.start, segment.end) for segment in segments]
+        times = np.asarray(segments, dtype=np.float64).reshape(-1, 2)
+
+        if self.sampleRate is None:
+            return _float_frame_ranges(self, times, n_frames=n_frames)
+
+        # times that are a whole number of half samples (up to float
+        # precision) are snapped to it, others are widened
+        half_samples = 2. * self.sampleRate * times
+        snapped = np.rint(half_samples)
+        half_samples = np.where(np.abs(half_samples - snapped) < 1e-6,
+                                snapped, half_samples)
+        start = np.floor(half_samples[:, 0]).astype(np.int64)
+        end = np.ceil(half_samples[:, 1]).astype(np.int64)
+
+        first, last = self._half_samples_to_frames(start, end)
+        if n_frames is not None:
+            first = np.minimum(first, n_frames)
+            last = np.minimum(last, n_frames)
+
+        return np.stack([first, last], axis=1)
+
+
+class _FeatureAligner(object):
+    """Buffer (streamed) engine outputs until all features are available
+
+    Parameters
+    ----------
+    definition : list
+        Feature definition.
+    columns : dict
+        Columns to keep for each feature (see `.columns()`).
+
+    Usage
+    -----
+    >>> available = _FeatureAligner(definition, columns)
+    >>> data = available(engine.readAllOutputs())
+    """
+
+    def __init__(self, definition, columns):
+        super(_FeatureAligner, self).__init__()
+        self.names = [name for name, _ in definition]
+        self.columns = columns
+        self.pending = {name: [] for name in self.names}
+
+    def __call__(self, outputs):
+        """Return newly aligned data (or None)
+
+        Data is (n_frames, dimension) or, for multi-channel outputs,
+        (n_frames, n_channels, dimension).
+        """
+
+        for name in self.names:
+            output = outputs.get(name)
+            if output is None or len(output) == 0:
+                continue
+            if name in self.columns:
+                output = output[..., self.columns[name]]
+            self.pending[name].append(output)
+
+        n_frames = min(sum(len(output) for output in self.pending[name])
+                       for name in self.names)
+        if n_frames == 0:
+            return None
+
+        data = []
+        for name in self.names:
+            output = np.vstack(self.pending[name])
+            data.append(output[:n_frames])
+            self.pending[name] = [output[n_frames:]]
+
+        return np.concatenate(data, axis=-1)
+
+
+class _FeatureWriter(object):
+    """Write (streamed) engine outputs into preallocated feature matrix
+
+    Parameters
+    ----------
+    slices : list
+        Columns of each feature in `out` (see `.feature_slices()`).
+    columns : dict
+        Columns to keep for each feature (see `.columns()`).
+    out : numpy array
+        (n_frames, [n_channels, ]dimension) feature matrix. Every feature
+        must fill exactly its n_frames rows: ValueError is raised as soon as
+        more frames are written, or when closing with fewer frames.
+
+    Usage
+    -----
+    >>> write = _FeatureWriter(slices, columns, out)
+    >>> write(engine.readAllOutputs())
+    >>> write.close()
+    """
+
+    def __init__(self, slices, columns, out):
+        super(_FeatureWriter, self).__init__()
+        self.slices = slices
+        self.out = out
+        self.columns = {}
+        for name, c in columns.items():
+            if c and list(c) == list(range(c[0], c[0] + len(c))):
+                # contiguous columns are selected without copy
+                c = slice(c[0], c[0] + len(c))
+            self.columns[name] = c
+        self.written = {name: 0 for name, _ in slices}
+
+    def _mismatch(self, name, n_frames):
+        return ValueError(
+            'Engine returned {n_frames:d} frames for feature "{name}" '
+            'instead of {expected:d}.'.format(
+                n_frames=n_frames, name=name, expected=len(self.out)))
+
+    def __call__(self, outputs):
+
+        for name, columns in self.slices:
+            output = outputs.get(name)
+            if output is None or len(output) == 0:
+                continue
+            if name in self.columns:
+                output = output[..., self.columns[name]]
+            start = self.written[name]
+            if start + len(output) > len(self.out):
+                raise self._mismatch(name, start + len(output))
+            self.out[start:start + len(output), ..., columns] = output
+            self.written[name] += len(output)
+
+    def close(self):
+        """Check that every feature filled its preallocated frames"""
+        for name, n_frames in self.written.items():
+            if n_frames != len(self.out):
+                raise self._mismatch(name, n_frames)
+
 
 class YaafeFeatureExtractor(object):
     """
@@ -75,11 +343,28 @@ class YaafeFeatureExtractor(object):
         Defaults to 512.
     step_size : int, optional
         Defaults to 256.
+    backend : {'yaafe', 'numpy'}, optional
+        Use `yaafelib` (default) or its pure NumPy implementation.
+        NumPy values are not verified against `yaafelib` yet (see
+        `pyannote.features.audio.numpy_backend`), hence a warning whenever
+        its engine is built.
+    resample : bool, optional
+        Resample audio whose sample rate differs from `sample_rate` (using
+        polyphase filtering). Defaults to failing on sample rate mismatch.
+    downmix : bool, optional
+        Average multi-channel audio into one channel at read time. Defaults
+        to extracting features for every channel (see `__call__`).
+    dtype : numpy dtype, optional
+        Floating point type of features (np.float32 or np.float64). With
+        "numpy" backend, features are also computed in this type. Defaults
+        to np.float64.
 
     """
 
     def __init__(
-        self, sample_rate=16000, block_size=512, step_size=256
+        self, sample_rate=16000, block_size=512, step_size=256,
+        backend=BACKEND_YAAFE, resample=False, downmix=False,
+        dtype=np.float64
     ):
 
         super(YaafeFeatureExtractor, self).__init__()
@@ -87,28 +372,70 @@ class YaafeFeatureExtractor(object):
         self.sample_rate = sample_rate
         self.block_size = block_size
         self.step_size = step_size
+        self.backend = backend
+        self.resample = resample
+        self.downmix = downmix
+        self.dtype = np.dtype(dtype)
+
+        # Yaafe engine is built lazily and cached (see _get_engine)
+        self._engine = None
+        self._engine_key = None
+        # additional engines for multi-channel audio (see _get_engines)
+        self._channel_engines = []
+        self._channel_engines_key = None
+
+        # opt-in per-stage profiling (see pyannote.features.audio.profiling)
+        self.profiler = None
+
+    def __getstate__(self):
+        # Yaafe engine cannot be pickled: it is rebuilt on first use
+        state = dict(self.__dict__)
+        state['_engine'] = None
+        state['_engine_key'] = None
+        state['_channel_engines'] = []
+        state['_channel_engines_key'] = None
+        # profiling only covers current process
+        state['profiler'] = None
+        return state
+
+    def _get_engine(self, definition):
+        """Get (cached) Yaafe engine for `definition`
+
+        The engine is only rebuilt when `definition`, sample rate or backend
+        changed since last call (e.g. because extractor parameters were
+        modified).
+        """
 
-    def extract(self, wav):
-        return self.__call__(wav)
+        key = (self.backend, self.sample_rate, self._engine_dtype,
+               tuple(definition))
+        if self._engine is not None and key == self._engine_key:
+            return self._engine
 
-    def dimension(self):
-        raise NotImplementedError('')
+        self._engine = self._build_engine(definition)
+        self._engine_key = key
 
-    def __call__(self, wav):
-        """Extract features
+        return self._engine
 
-        Parameters
-        ----------
-        wav : string
-            Path to wav file.
+    def _build_engine(self, definition):
+        """Build new Yaafe engine for `definition`"""
 
-        Returns
-        -------
-        features : SlidingWindowFeature
+        if self.backend == BACKEND_NUMPY:
+            # TODO: remove once values are checked against yaafelib outputs
+            warnings.warn(
+                'NumPy backend values have not been verified against '
+                'yaafelib (see pyannote.features.audio.numpy_backend).')
+            engine = NumpyEngine(sample_rate=self.sample_rate,
+                                 dtype=self._engine_dtype)
+            engine.load(definition)
+            return engine
 
-        """
+        if self.backend != BACKEND_YAAFE:
+            raise ValueError(
+                'Unknown backend "{backend}".'.format(backend=self.backend))
 
-        definition = self.definition()
+        if yaafelib is None:
+            raise ImportError(
+                'yaafelib is not available: use backend="numpy" instead.')
 
         # --- prepare the feature plan
         feature_plan = yaafelib.FeaturePlan(sample_rate=self.sample_rate)
@@ -122,26 +449,413 @@ class YaafeFeatureExtractor(object):
         engine = yaafelib.Engine()
         engine.load(data_flow)
 
-        sample_rate, raw_audio = scipy.io.wavfile.read(wav)
-        assert sample_rate == self.sample_rate, "sample rate mismatch"
+        return engine
+
+    @property
+    def _engine_dtype(self):
+        """Floating point type of engine input (yaafelib only does float64)"""
+        if self.backend == BACKEND_NUMPY:
+            return self.dtype
+        return np.dtype(np.float64)
+
+    def extract(self, wav, sample_rate=None, split_channels=False,
+                split_features=False):
+        return self.__call__(wav, sample_rate=sample_rate,
+                             split_channels=split_channels,
+                             split_features=split_features)
+
+    def extract_many(self, wavs, n_jobs=1, chunksize=1, ordered=True,
+                     cache=None):
+        """Extract features from many files in parallel
+
+        Parameters
+        ----------
+        wavs : iterable
+            Paths to wav files.
+        n_jobs : int, optional
+            Number of worker processes. Defaults to 1 (i.e. no worker: files
+            are processed in current process). Use None for as many workers
+            as CPUs.
+        chunksize : int, optional
+            Number of files sent to a worker at once. Defaults to 1.
+        ordered : boolean, optional
+            When True (default), results are yielded in input order.
+            Otherwise, they are yielded as soon as they are available.
+        cache : FeatureCache, optional
+            When provided, features are read from (or written to) `cache`.
+
+        Yields
+        ------
+        wav : string
+            Path to wav file.
+        features : SlidingWindowFeature
+            Extracted features (None in case of error).
+        error : Exception
+            Exception raised while processing `wav` (None in case of success).
+            Errors do not interrupt the processing of remaining files.
+
+        Usage
+        -----
+        >>> for wav, features, error in extractor.extract_many(wavs, n_jobs=8):
+        ...     if error is not None:
+        ...         print('{wav}: {error}'.format(wav=wav, error=error))
+        """
+
+        if n_jobs == 1:
+            for wav in wavs:
+                yield _extract(self, wav, cache=cache)
+            return
+
+        # each worker gets its own copy of the extractor (hence its own
+        # cached engine) once and for all
+        pool = multiprocessing.Pool(processes=n_jobs,
+                                    initializer=_initialize_worker,
+                                    initargs=(self, cache))
+
+        imap = pool.imap if ordered else pool.imap_unordered
+
+        try:
+            for result in imap(_extract_in_worker, wavs, chunksize=chunksize):
+                yield result
+            pool.close()
+        finally:
+            pool.terminate()
+            pool.join()
+
+    def dimension(self):
+        raise NotImplementedError('')
+
+    def columns(self):
+        """Columns to keep for each feature of `definition()`
+
+        Returns
+        -------
+        columns : dict
+            List of column indices, indexed by feature name.
+            Features missing from this dictionary are kept entirely.
+        """
+        return {}
+
+    def feature_slices(self):
+        """Columns of each feature of `definition()` in extracted features
+
+        Returns
+        -------
+        slices : list
+            List of (name, slice) tuples, in `definition()` order.
+        """
+
+        columns = self.columns()
 
-        audio = np.array(raw_audio, dtype=np.float64, order='C').reshape(1, -1)
+        slices, start = [], 0
+        for name, recipe in self.definition():
+            if name in columns:
+                width = len(columns[name])
+            else:
+                width = dimension(recipe)
+            slices.append((name, slice(start, start + width)))
+            start += width
 
-        features = engine.processAudio(audio)
-        data = np.hstack([features[name] for name, _ in definition])
+        return slices
+
+    def __call__(self, wav, sample_rate=None, split_channels=False,
+                 split_features=False):
+        """Extract features
+
+        Parameters
+        ----------
+        wav : string, file object or numpy array
+            Path to wav file, binary file object containing wav data, or
+            in-memory (n_samples, ) or (n_samples, n_channels) array of audio
+            samples.
+        sample_rate : int, optional
+            Sample rate of in-memory audio (mandatory in this case).
+        split_channels : bool, optional
+            Return a list of one SlidingWindowFeature per channel (with only
+            one item for mono or downmixed audio). Defaults to one
+            SlidingWindowFeature whose data is a (n_frames, n_channels,
+            dimension) array for multi-channel audio.
+        split_features : bool, optional
+            Return a dictionary of SlidingWindowFeature indexed by feature
+            name (see `feature_slices`), whose data are views on the columns
+            of the complete feature matrix (i.e. no copy).
+
+        Returns
+        -------
+        features : SlidingWindowFeature
+            Features of mono (or downmixed) audio are (n_frames, dimension).
+            With `split_channels`, a list (one item per channel) of those,
+            even for mono (or downmixed) audio.
+            With `split_features`, a dictionary (or list of dictionaries) of
+            those.
+
+        """
+
+        profiler = NULL_PROFILER if self.profiler is None else self.profiler
+        profiler.start()
+
+        definition = self.definition()
+        with profiler.stage('engine'):
+            engine = self._get_engine(definition)
+
+        # wav file is memory-mapped and processed one block at a time
+        with profiler.stage('open'):
+            reader = self._get_reader(wav, sample_rate=sample_rate)
+        n_channels = reader.n_channels
+        blocks = profiler.iterate('read', reader.blocks())
+
+        try:
+            slices = self.feature_slices()
+        except ValueError as e:
+            # unknown feature dimension: stack aligned blocks
+            if split_features:
+                raise ValueError(
+                    'split_features is not supported by this extractor: '
+                    'columns of each feature are unknown ({e}).'.format(e=e))
+            slices = None
+
+        if slices is None:
+            data = list(self._stream(engine, definition, blocks,
+                                     n_channels=n_channels,
+                                     profiler=profiler))
+            with profiler.stage('assemble'):
+                if data:
+                    data = np.vstack(data)
+                else:
+                    data = self._empty(0, n_channels)
+
+        else:
+            # each feature is written into its columns of the output matrix
+            # as soon as it is computed (no intermediate stacking)
+            n_frames = -(-reader.n_samples // self.step_size)
+            data = self._empty(n_frames, n_channels)
+            assert slices[-1][1].stop == self.dimension()
+
+            with profiler.stage('engine'):
+                engines = self._get_engines(engine, definition, n_channels)
+            if len(engines) > 1:
+                writers = [_FeatureWriter(slices, self.columns(), data[:, c])
+                           for c in range(n_channels)]
+            else:
+                writers = [_FeatureWriter(slices, self.columns(), data)]
+
+            for outputs in self._process(engines, blocks, n_channels,
+                                         profiler=profiler):
+                with profiler.stage('assemble'):
+                    for write, output in zip(writers, outputs):
+                        write(output)
+
+            for write in writers:
+                write.close()
+
+        profiler.add('assemble', 0., nbytes=data.nbytes)
+        profiler.stop(reader.duration)
 
         sliding_window = YaafeFrame(
             blockSize=self.block_size, stepSize=self.step_size,
             sampleRate=self.sample_rate)
 
-        return SlidingWindowFeature(data, sliding_window)
+        if split_channels and n_channels > 1:
+            channels = [data[:, c] for c in range(n_channels)]
+        else:
+            channels = [data]
+
+        if split_features:
+            features = [
+                {name: SlidingWindowFeature(d[..., columns], sliding_window)
+                 for name, columns in slices}
+                for d in channels]
+        else:
+            features = [SlidingWindowFeature(d, sliding_window)
+                        for d in channels]
+
+        if split_channels:
+            return features
+        return features[0]
+
+    def _empty(self, n_frames, n_channels=1):
+        """Allocate (n_frames, [n_channels, ]dimension) feature matrix"""
+        shape = (n_frames, ) if n_channels == 1 else (n_frames, n_channels)
+        return np.empty(shape + (self.dimension(), ), dtype=self.dtype)
+
+    def _get_reader(self, wav, sample_rate=None):
+        """Get audio reader (resampling audio if requested)"""
+        resample = self.sample_rate if self.resample else None
+        reader = AudioReader(wav, dtype=self._engine_dtype,
+                             sample_rate=sample_rate,
+                             resample=resample, downmix=self.downmix)
+        assert reader.sample_rate == self.sample_rate, "sample rate mismatch"
+        return reader
+
+    def _get_engines(self, engine, definition, n_channels=1):
+        """Get engines needed to process `n_channels` channels at once"""
+
+        if n_channels > 1 and self.backend == BACKEND_YAAFE:
+            # yaafelib only processes mono audio: one engine per channel.
+            # additional engines are cached as long as main one is.
+            if self._channel_engines_key != self._engine_key:
+                self._channel_engines = []
+                self._channel_engines_key = self._engine_key
+            while len(self._channel_engines) < n_channels - 1:
+                self._channel_engines.append(self._build_engine(definition))
+            return [engine] + self._channel_engines[:n_channels - 1]
+
+        # NumpyEngine processes all channels at once
+        return [engine]
+
+    def _process(self, engines, blocks, n_channels=1,
+                 profiler=NULL_PROFILER):
+        """Stream audio `blocks` through `engines`
+
+        Parameters
+        ----------
+        engines : list
+            Engines returned by `_get_engines`.
+        blocks : iterable
+            Consecutive (n_samples, ) or (n_samples, n_channels) audio blocks.
+        n_channels : int, optional
+            Number of channels. Defaults to 1.
+        profiler : Profiler, optional
+            Time engines as "process" stage.
+
+        Yields
+        ------
+        outputs : list
+            Newly available outputs of each engine (as returned by their
+            `readAllOutputs` method), after each block and after flushing.
+        """
+
+        # make sure no state is carried over from previous file
+        for engine in engines:
+            engine.reset()
+
+        for block in blocks:
+            with profiler.stage('process'):
+                block = np.asarray(block, dtype=self._engine_dtype)
+                if len(engines) > 1:
+                    inputs = [np.ascontiguousarray(block[:, c]).reshape(1, -1)
+                              for c in range(n_channels)]
+                elif block.ndim > 1:
+                    inputs = [block.T]
+                else:
+                    inputs = [block.reshape(1, -1)]
+                for engine, samples in zip(engines, inputs):
+                    engine.writeInput('audio', samples)
+                    engine.process()
+                outputs = [engine.readAllOutputs() for engine in engines]
+            yield outputs
+
+        with profiler.stage('process'):
+            for engine in engines:
+                engine.flush()
+            outputs = [engine.readAllOutputs() for engine in engines]
+        yield outputs
+
+    def _stream(self, engine, definition, blocks, n_channels=1,
+                profiler=NULL_PROFILER):
+        """Stream audio `blocks` through `engine`
+
+        Parameters
+        ----------
+        engine : yaafelib.Engine or NumpyEngine
+        definition : list
+            Feature definition loaded in `engine`.
+        blocks : iterable
+            Consecutive (n_samples, ) or (n_samples, n_channels) audio blocks.
+        n_channels : int, optional
+            Number of channels. Defaults to 1.
+        profiler : Profiler, optional
+            Time engines as "process" stage and alignment as "assemble".
+
+        Yields
+        ------
+        data : (n_frames, dimension) numpy array
+            Newly available frames, or (n_frames, n_channels, dimension) for
+            multi-channel audio. Features may not be available at the same
+            pace (e.g. derivatives need a few frames of context): frames are
+            only yielded once all features are available.
+        """
+
+        engines = self._get_engines(engine, definition, n_channels)
+
+        columns = self.columns()
+        aligners = [_FeatureAligner(definition, columns) for _ in engines]
+
+        for outputs in self._process(engines, blocks, n_channels,
+                                     profiler=profiler):
+
+            with profiler.stage('assemble'):
+                data = [available(output)
+                        for available, output in zip(aligners, outputs)]
+
+                # per-channel engines produce frames at the very same pace
+                if data[0] is not None:
+                    if len(data) > 1:
+                        data = np.stack(data, axis=1)
+                    else:
+                        data = data[0]
+                    data = data.astype(self.dtype, copy=False)
+                else:
+                    data = None
+
+            if data is not None:
+                yield data
+
+    def iter_chunks(self, wav, chunk_duration=60., sample_rate=None):
+        """Extract features chunk by chunk
+
+        Audio is read (and processed) one chunk at a time so that memory usage
+        does not depend on the duration of the file.
+
+        Parameters
+        ----------
+        wav : string, file object or numpy array
+            Path to wav file, binary file object containing wav data, or
+            in-memory (n_samples, ) or (n_samples, n_channels) array of audio
+            samples.
+        chunk_duration : float, optional
+            Duration of audio chunks, in seconds. Defaults to one minute.
+        sample_rate : int, optional
+            Sample rate of in-memory audio (mandatory in this case).
+
+        Yields
+        ------
+        features : SlidingWindowFeature
+            Consecutive pieces of features. Stacking their data gives the same
+            result as `extract(wav)`.
+        """
+
+        definition = self.definition()
+        engine = self._get_engine(definition)
+
+        reader = self._get_reader(wav, sample_rate=sample_rate)
+
+        # blocks are made of original (i.e. not resampled) samples
+        chunk_size = max(1, int(chunk_duration * reader.original_sample_rate))
+        blocks = reader.blocks(chunk_size=chunk_size)
+
+        frame = YaafeFrame(
+            blockSize=self.block_size, stepSize=self.step_size,
+            sampleRate=self.sample_rate)
+
+        n_frames = 0
+        for data in self._stream(engine, definition, blocks,
+                                 n_channels=reader.n_channels):
+            # sliding window starting at first frame of this chunk
+            sliding_window = SlidingWindow(
+                duration=frame.duration, step=frame.step,
+                start=frame.start + n_frames * frame.step)
+            yield SlidingWindowFeature(data, sliding_window)
+            n_frames += len(data)
 
 
 class YaafeCompound(YaafeFeatureExtractor):
 
     def __init__(
         self, extractors,
-        sample_rate=16000, block_size=512, step_size=256
+        sample_rate=16000, block_size=512, step_size=256,
+        backend=BACKEND_YAAFE, resample=False, downmix=False,
+        dtype=np.float64
     ):
 
         assert all(e.sample_rate == sample_rate for e in extractors)
@@ -151,7 +865,11 @@ class YaafeCompound(YaafeFeatureExtractor):
         super(YaafeCompound, self).__init__(
             sample_rate=sample_rate,
             block_size=block_size,
-            step_size=step_size)
+            step_size=step_size,
+            backend=backend,
+            resample=resample,
+            downmix=downmix,
+            dtype=dtype)
 
         self.extractors = extractors
 
@@ -162,8 +880,16 @@ class YaafeCompound(YaafeFeatureExtractor):
         return [(name, recipe)
                 for e in self.extractors for name, recipe in e.definition()]
 
+    def columns(self):
+        return {name: columns
+                for e in self.extractors
+                for name, columns in e.columns().items()}
+
     def __hash__(self):
-        return hash(tuple(self.definition()))
+        # MFCC definitions no longer differ when only energy flags change
+        columns = sorted((name, tuple(c))
+                         for name, c in self.columns().items())
+        return hash((tuple(self.definition()), tuple(columns)))
 
 
 class YaafeZCR(YaafeFeatureExtractor):
@@ -209,6 +935,14 @@ class YaafeMFCC(YaafeFeatureExtractor):
         Defaults to 512.
     step_size : int, optional
         Defaults to 256.
+    backend : {'yaafe', 'numpy'}, optional
+        Defaults to 'yaafe'.
+    resample : bool, optional
+        Resample audio to `sample_rate` if needed. Defaults to False.
+    downmix : bool, optional
+        Average multi-channel audio into one channel. Defaults to False.
+    dtype : numpy dtype, optional
+        np.float32 or np.float64 (default).
 
     e : bool, optional
         Energy. Defaults to True.
@@ -236,12 +970,18 @@ class YaafeMFCC(YaafeFeatureExtractor):
     def __init__(
         self, sample_rate=16000, block_size=512, step_size=256,
         e=True, coefs=11, De=False, DDe=False, D=False, DD=False,
+        backend=BACKEND_YAAFE, resample=False, downmix=False,
+        dtype=np.float64
     ):
 
         super(YaafeMFCC, self).__init__(
             sample_rate=sample_rate,
             block_size=block_size,
-            step_size=step_size
+            step_size=step_size,
+            backend=backend,
+            resample=resample,
+            downmix=downmix,
+            dtype=dtype
         )
 
         self.e = e
@@ -265,40 +1005,210 @@ class YaafeMFCC(YaafeFeatureExtractor):
 
     def definition(self):
 
-        d = []
-
-        # --- coefficients
-        # 0 if energy is kept
-        # 1 if energy is removed
-        d.append((
-            "mfcc",
-            "MFCC CepsIgnoreFirstCoeff=%d CepsNbCoeffs=%d "
+        # static coefficients (energy + coefs) are computed by one single MFCC
+        # step shared by all features: both Yaafe and NumpyEngine factorize
+        # it, so that derivatives are computed from the very same matrix.
+        # unrequested columns are removed afterwards (see .columns())
+        mfcc = (
+            "MFCC CepsIgnoreFirstCoeff=0 CepsNbCoeffs=%d "
             "blockSize=%d stepSize=%d" % (
-                0 if self.e else 1,
-                self.coefs + self.e * 1,
-                self.block_size, self.step_size
-            )))
+                self.coefs + 1, self.block_size, self.step_size))
+
+        d = [("mfcc", mfcc)]
 
         # --- 1st order derivatives
         if self.De or self.D:
-            d.append((
-                "mfcc_d",
-                "MFCC CepsIgnoreFirstCoeff=%d CepsNbCoeffs=%d "
-                "blockSize=%d stepSize=%d > Derivate DOrder=1" % (
-                    0 if self.De else 1,
-                    self.D * self.coefs + self.De * 1,
-                    self.block_size, self.step_size
-                )))
+            d.append(("mfcc_d", mfcc + " > Derivate DOrder=1"))
 
         # --- 2nd order derivatives
         if self.DDe or self.DD:
-            d.append((
-                "mfcc_dd",
-                "MFCC CepsIgnoreFirstCoeff=%d CepsNbCoeffs=%d "
-                "blockSize=%d stepSize=%d > Derivate DOrder=2" % (
-                    0 if self.DDe else 1,
-                    self.DD * self.coefs + self.DDe * 1,
-                    self.block_size, self.step_size
-                )))
+            d.append(("mfcc_dd", mfcc + " > Derivate DOrder=2"))
 
         return d
+
+    def columns(self):
+
+        energy = [0]
+        coefs = list(range(1, self.coefs + 1))
+
+        c = {"mfcc": energy * self.e + coefs}
+
+        if self.De or self.D:
+            c["mfcc_d"] = energy * self.De + coefs * self.D
+
+        if self.DDe or self.DD:
+            c["mfcc_dd"] = energy * self.DDe + coefs * self.DD
+
+        return c
+
+
+class OnlineFeatureExtractor(object):
+    """Online feature extraction from live audio streams
+
+    Parameters
+    ----------
+    extractor : YaafeFeatureExtractor
+        e.g. YaafeMFCC, YaafeZCR or SpeechActivityDetectionFeatures.
+    sample_rate : int, optional
+        Sample rate of the stream. Defaults to extractor sample rate. Like
+        offline extraction, it may only differ if extractor resamples audio.
+
+    Streams are mono: multi-channel samples are only accepted if extractor
+    downmixes audio.
+
+    Usage
+    -----
+    >>> online = OnlineFeatureExtractor(extractor)
+    >>> for samples in stream:
+    ...     features = online.push(samples)  # newly available frames
+    >>> features = online.flush()  # end of stream
+
+    Concatenating all returned frames gives the very same features as
+    offline extraction of the whole stream.
+    """
+
+    def __init__(self, extractor, sample_rate=None):
+        super(OnlineFeatureExtractor, self).__init__()
+
+        # private copy of the extractor, hence of its engine, so that it can
+        # still be used for offline extraction in the meantime
+        self.extractor = copy.deepcopy(extractor)
+        self._definition = self.extractor.definition()
+        self._engine = self.extractor._get_engine(self._definition)
+
+        self._frame = YaafeFrame(
+            blockSize=self.extractor.block_size,
+            stepSize=self.extractor.step_size,
+            sampleRate=self.extractor.sample_rate)
+
+        if sample_rate is None:
+            sample_rate = self.extractor.sample_rate
+        self.sample_rate = sample_rate
+
+        self._resampler = None
+        if sample_rate != self.extractor.sample_rate:
+            if not self.extractor.resample:
+                msg = ('Stream sample rate ({sample_rate:d}Hz) differs from '
+                       'extractor one ({expected:d}Hz): use resample=True.')
+                raise ValueError(msg.format(
+                    sample_rate=sample_rate,
+                    expected=self.extractor.sample_rate))
+            self._resampler = Resampler(sample_rate,
+                                        self.extractor.sample_rate)
+
+        self.reset()
+
+    def reset(self):
+        """Start a new stream"""
+        self._engine.reset()
+        if self._resampler is not None:
+            self._resampler.reset()
+        self._available = _FeatureAligner(self._definition,
+                                          self.extractor.columns())
+        self._n_frames = 0
+
+    @property
+    def latency(self):
+        """Algorithmic latency, in seconds
+
+        i.e. duration of audio that must be received after the middle of a
+        frame before this frame is returned: half a block for framing, plus
+        derivatives lookahead (if any), plus resampling filter delay (if
+        any).
+        """
+
+        lookahead = 0
+        for _, recipe in self._definition:
+            frames = 0
+            for name, params in parse(recipe)[1:]:
+                if name == 'Derivate':
+                    frames += params['DO1Len']
+                    if params['DOrder'] == 2:
+                        frames += params['DO2Len']
+            lookahead = max(lookahead, frames)
+
+        block_size = self.extractor.block_size
+        step_size = self.extractor.step_size
+        n_samples = block_size - block_size // 2 + lookahead * step_size
+        if self._resampler is not None:
+            # resampled samples are only available once their last
+            # contributing input sample has been received
+            n_samples += self._resampler._delay
+        return 1. * n_samples / self.extractor.sample_rate
+
+    def _features(self, data):
+
+        if data is None:
+            data = np.zeros((0, self.extractor.dimension()),
+                            dtype=self.extractor.dtype)
+
+        data = data.astype(self.extractor.dtype, copy=False)
+        sliding_window = SlidingWindow(
+            duration=self._frame.duration, step=self._frame.step,
+            start=self._frame.start + self._n_frames * self._frame.step)
+        self._n_frames += len(data)
+
+        return SlidingWindowFeature(data, sliding_window)
+
+    def push(self, samples):
+        """Push new audio samples
+
+        Parameters
+        ----------
+        samples : numpy array
+            (n_samples, ) array of new audio samples, or (n_samples,
+            n_channels) if extractor downmixes audio.
+
+        Returns
+        -------
+        features : SlidingWindowFeature
+            Newly available frames (possibly none).
+        """
+        samples = self._convert(samples)
+        if self._resampler is not None:
+            samples = self._resampler.process(samples)
+        self._engine.writeInput('audio', samples.reshape(1, -1))
+        self._engine.process()
+        return self._features(self._available(self._engine.readAllOutputs()))
+
+    def _convert(self, samples):
+        """Convert samples to (n_samples, ) array (downmixing if requested)"""
+
+        samples = np.asarray(samples)
+        if samples.ndim > 2:
+            raise ValueError(
+                'Samples must be a (n_samples, ) or (n_samples, n_channels) '
+                'array: got {shape}.'.format(shape=samples.shape))
+
+        if samples.ndim == 2 and samples.shape[1] > 1:
+            if not self.extractor.downmix:
+                raise ValueError(
+                    'Online feature extraction only supports mono streams: '
+                    'use downmix=True for {n:d}-channel audio.'.format(
+                        n=samples.shape[1]))
+            samples = np.mean(samples, axis=1,
+                              dtype=self.extractor._engine_dtype)
+
+        samples = np.ascontiguousarray(samples,
+                                       dtype=self.extractor._engine_dtype)
+        return samples.reshape(-1)
+
+    def flush(self):
+        """Mark the end of the stream
+
+        Returns
+        -------
+        features : SlidingWindowFeature
+            Remaining frames.
+        """
+        if self._resampler is not None:
+            samples = self._resampler.process(
+                np.zeros((0, ), dtype=self.extractor._engine_dtype),
+                final=True)
+            self._engine.writeInput('audio', samples.reshape(1, -1))
+            self._engine.process()
+        self._engine.flush()
+        features = self._features(
+            self._available(self._engine.readAllOutputs()))
+        self.reset()
+        return features
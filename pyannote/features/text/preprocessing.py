@@ -28,6 +28,8 @@
 
 from __future__ import unicode_literals
 
+import multiprocessing
+from collections import namedtuple, OrderedDict
 
 import nltk
 
@@ -49,6 +51,62 @@ POS_INV_MAPPING = {
 }
 
 
+# text pre-processing of current worker process (see .batch)
+_worker_preprocessing = None
+
+
+def _initialize_worker(preprocessing):
+    global _worker_preprocessing
+    _worker_preprocessing = preprocessing
+
+
+def _batch_in_worker(documents):
+    return _worker_preprocessing.batch(documents)
+
+
+CacheInfo = namedtuple('CacheInfo', ['hits', 'misses', 'maxsize', 'currsize'])
+
+
+class _LRUCache(object):
+    """Bounded least recently used cache of func(key)
+
+    Parameters
+    ----------
+    func : callable
+        Function of a single (hashable) argument.
+    maxsize : int, optional
+        Maximum number of cached results. Defaults to no limit.
+    """
+
+    def __init__(self, func, maxsize=None):
+        super(_LRUCache, self).__init__()
+        self.func = func
+        self.maxsize = maxsize
+        self.clear()
+
+    def clear(self):
+        self._data = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def __call__(self, key):
+        try:
+            # move to most recently used end
+            value = self._data.pop(key)
+            self.hits += 1
+        except KeyError:
+            value = self.func(key)
+            self.misses += 1
+            if self.maxsize is not None and len(self._data) >= self.maxsize:
+                self._data.popitem(last=False)
+        self._data[key] = value
+        return value
+
+    def info(self):
+        return CacheInfo(self.hits, self.misses, self.maxsize,
+                         len(self._data))
+
+
 class TextPreProcessing(object):
     """Text pre-processing
 
@@ -65,8 +123,13 @@ class TextPreProcessing(object):
     pos_tag : func, optional
         Set pos_tagging function (list --> pos list)
         Defaults to NLTK pos_tag.
-    keep_pos : set or boolean, optional
-        Only words with POS-tag in `keep_pos` are kept.
+    pos_tag_sents : func, optional
+        Set batch pos_tagging function (list of lists --> list of pos lists)
+        used by `.batch()`. Defaults to NLTK pos_tag_sents when `pos_tag` is
+        NLTK pos_tag, and to applying `pos_tag` to each document otherwise.
+    keep_pos : iterable or boolean, optional
+        Only words with POS-tag in `keep_pos` are kept (include None to keep
+        words whose POS-tag has no WordNet equivalent).
         If `keep_pos` is False, keep all words.
         Defaults to NLTK Wordnet's {ADJ, NOUN, ADV, VERB}
     lemmatize : func or boolean, optional
@@ -77,11 +140,21 @@ class TextPreProcessing(object):
         Set stemming function
         If `stem` is False, do not apply stemming.
         Defaults to NLTK Porter stemmer.
+    cache_size : int, optional
+        Lemmatization and stemming results are memoized for the `cache_size`
+        most recently seen (word, WordNet POS-tag) pairs (see `.cache_info()`).
+        Set `cache_size` to 0 to disable memoization, or to None for an
+        unbounded cache. Defaults to 100000.
+
+    Pickling (e.g. to send pre-processing to worker processes, see `.batch`)
+    keeps current attributes, except for NLTK tools which are loaded again
+    when unpickling. Custom functions must therefore be picklable.
 
     """
 
     def __init__(self, tokenize=True, lemmatize=True, stem=True,
-                 stopwords=True, pos_tag=True, keep_pos=True, min_length=2):
+                 stopwords=True, pos_tag=True, keep_pos=True, min_length=2,
+                 cache_size=100000, pos_tag_sents=True):
 
         super(TextPreProcessing, self).__init__()
 
@@ -100,6 +173,8 @@ class TextPreProcessing(object):
         else:
             self.pos_tag = pos_tag
 
+        self.pos_tag_sents = pos_tag_sents
+
         if lemmatize is True:
             self.lemmatize = nltk.WordNetLemmatizer().lemmatize
         else:
@@ -120,45 +195,268 @@ class TextPreProcessing(object):
 
         self.min_length = min_length
 
+        self.cache_size = cache_size
+        self._set_normalize()
+
+        # NLTK tools cannot (or should not) be pickled: they are loaded
+        # again when unpickling (see __getstate__)
+        self._nltk_tools = {
+            name: getattr(self, name)
+            for name, argument in [('tokenize', tokenize),
+                                   ('pos_tag', pos_tag),
+                                   ('lemmatize', lemmatize), ('stem', stem)]
+            if argument is True}
+
+        self._plan()
+
+    def __setattr__(self, name, value):
+        super(TextPreProcessing, self).__setattr__(name, value)
+        # lookup sets are derived from public attributes whenever they are
+        # set, so that changing them after construction is taken into account
+        if name == 'stopwords':
+            self._set_stopwords()
+        elif name == 'keep_pos':
+            self._set_keep_pos()
+        elif name in ('pos_tag', 'pos_tag_sents') and \
+                'pos_tag_sents' in self.__dict__:
+            self._set_pos_tag_sents()
+        # memoized results are stale as soon as lemmatization or stemming
+        # changes
+        elif name in ('lemmatize', 'stem', 'cache_size') and \
+                '_normalize' in self.__dict__:
+            self._set_normalize()
+        # pre-processing pipeline is planned again when a stage is (un)set
+        if name in ('stopwords', 'keep_pos', 'lemmatize', 'stem') and \
+                '_stages' in self.__dict__:
+            self._plan()
+
+    def _set_stopwords(self):
+        # hashed lookup (rather than linear scan) for every token
+        self._stopwords = self.stopwords if self.stopwords is False \
+            else frozenset(self.stopwords)
+
+    def _set_keep_pos(self):
+
+        self._keep_pos = self.keep_pos if self.keep_pos is False \
+            else frozenset(self.keep_pos)
+
+        if self._keep_pos is False:
+            return
+
+        # POS filtering boils down to checking (Penn Treebank) tags against
+        # a precomputed set: either tags to keep or, when `keep_pos` contains
+        # None (i.e. unmapped tags are kept), tags to remove.
+        self._keep_tags = None not in self._keep_pos
+        self._tags = frozenset(
+            tag for tag, wordnet_pos_tag in POS_INV_MAPPING.iteritems()
+            if (wordnet_pos_tag in self._keep_pos) == self._keep_tags)
+
+    def _set_pos_tag_sents(self):
+        # NLTK batch tagger only replaces NLTK tagger
+        self._pos_tag_sents = self.pos_tag_sents
+        if self._pos_tag_sents is True:
+            self._pos_tag_sents = nltk.pos_tag_sents \
+                if self.pos_tag is nltk.pos_tag else False
+
+    def _set_normalize(self):
+        # natural language vocabularies are Zipfian: few (word, POS) pairs
+        # make up most tokens, hence most lemmatization and stemming calls
+        self._normalize = self._lemmatize_and_stem
+        if self.cache_size != 0:
+            self._normalize = _LRUCache(self._lemmatize_and_stem,
+                                        maxsize=self.cache_size)
+
+    def _lemmatize_and_stem(self, key):
+        word, pos = key
+        if self.lemmatize is not False:
+            word = self.lemmatize(word, pos=pos)
+        if self.stem is not False:
+            word = self.stem(word)
+        return word
+
+    def cache_info(self):
+        """Lemmatization and stemming cache statistics
+
+        Returns
+        -------
+        info : CacheInfo
+            (hits, misses, maxsize, currsize) named tuple. All zeros when
+            memoization is disabled.
+        """
+        if self.cache_size == 0:
+            return CacheInfo(0, 0, 0, 0)
+        return self._normalize.info()
+
+    def cache_clear(self):
+        """Clear lemmatization and stemming cache (and statistics)"""
+        if self.cache_size != 0:
+            self._normalize.clear()
+
+    def __getstate__(self):
+        """Current attributes, as constructor arguments"""
+
+        arguments = {
+            'tokenize': self.tokenize, 'lemmatize': self.lemmatize,
+            'stem': self.stem, 'stopwords': self._stopwords,
+            'pos_tag': self.pos_tag, 'keep_pos': self._keep_pos,
+            'min_length': self.min_length, 'cache_size': self.cache_size,
+            'pos_tag_sents': self.pos_tag_sents}
+
+        for name, tool in self._nltk_tools.items():
+            if arguments[name] is tool:
+                arguments[name] = True
+
+        return arguments
+
+    def __setstate__(self, arguments):
+        self.__init__(**arguments)
+
+    def _tokenize(self, text):
+        if self.tokenize is False:
+            return text
+        return self.tokenize(text.lower())
+
+    def _plan(self):
+        """Plan pre-processing pipeline
+
+        Only stages whose output is actually needed are run. In particular,
+        POS-tagging (usually the most expensive stage) is skipped when
+        neither POS filtering nor lemmatization use its output.
+
+        Stopwords are only removed before POS-tagging when POS-tagging is
+        skipped: removing them before would change the context of the
+        tagger, hence the tags.
+        """
+
+        self._pos_tagging = self.keep_pos is not False or \
+            self.lemmatize is not False
+
+        stages = []
+
+        if self.stopwords is not False:
+            stages.append(self._remove_tagged_stopwords if self._pos_tagging
+                          else self._remove_stopwords)
+
+        if self.keep_pos is not False:
+            stages.append(self._filter_pos)
+
+        if self.lemmatize is not False:
+            stages.append(self._lemmatize_and_stem_tagged)
+        else:
+            if self._pos_tagging:
+                stages.append(self._remove_tags)
+            if self.stem is not False:
+                stages.append(self._stem_words)
+
+        stages.append(self._remove_short)
+
+        self._stages = stages
+
     def __call__(self, text):
 
         # tokenize
-        if self.tokenize is False:
-            tokenized = text
-        else:
-            tokenized = self.tokenize(text.lower())
+        tokens = self._tokenize(text)
 
         # pos-tag
-        pos_tagged = self.pos_tag(tokenized)
+        if self._pos_tagging:
+            tokens = self.pos_tag(tokens)
+
+        return self._process(tokens)
+
+    def batch(self, documents, n_jobs=1, chunksize=None):
+        """Pre-process a collection of documents
+
+        Same as [self(text) for text in documents], but all documents are
+        pos-tagged at once (see `pos_tag_sents`), saving per-call overhead
+        of taggers such as NLTK's (e.g. loading the tagger).
+
+        Parameters
+        ----------
+        documents : iterable
+            Texts (or pre-tokenized lists when `tokenize` is False).
+        n_jobs : int, optional
+            Number of worker processes. Defaults to 1 (i.e. no worker:
+            documents are processed in current process). Use None for as many
+            workers as CPUs.
+        chunksize : int, optional
+            Number of documents sent to a worker at once. Defaults to about
+            four chunks per worker.
+
+        Returns
+        -------
+        processed : list
+            List of pre-processed documents (in input order).
+        """
+
+        if n_jobs == 1:
+            return self._batch(documents)
+
+        documents = list(documents)
+        if n_jobs is None:
+            n_jobs = multiprocessing.cpu_count()
+        if chunksize is None:
+            chunksize = max(1, -(-len(documents) // (4 * n_jobs)))
+        chunks = [documents[i:i + chunksize]
+                  for i in range(0, len(documents), chunksize)]
+
+        # each worker gets its own copy of the pre-processing (hence loads
+        # NLTK tools and fills its lemmatization and stemming cache) once
+        # and for all
+        pool = multiprocessing.Pool(processes=n_jobs,
+                                    initializer=_initialize_worker,
+                                    initargs=(self, ))
+
+        try:
+            processed = []
+            for chunk in pool.imap(_batch_in_worker, chunks):
+                processed.extend(chunk)
+            pool.close()
+        finally:
+            pool.terminate()
+            pool.join()
+
+        return processed
+
+    def _batch(self, documents):
 
-        # remove stop words
-        if self.stopwords is False:
-            stopworded = pos_tagged
-        else:
-            stopworded = [(word, pos_tag) for word, pos_tag in pos_tagged
-                          if word not in self.stopwords]
+        # tokenize
+        tokenized = [self._tokenize(text) for text in documents]
 
-        # remove pos words
-        if self.keep_pos is False:
-            filtered = stopworded
-        else:
-            filtered = [(word, tag) for word, tag in stopworded
-                        if POS_INV_MAPPING.get(tag, None) in self.keep_pos]
+        # pos-tag
+        if self._pos_tagging:
+            if self._pos_tag_sents is False:
+                tokenized = [self.pos_tag(tokens) for tokens in tokenized]
+            else:
+                tokenized = self._pos_tag_sents(tokenized)
 
-        # lemmatize
-        if self.lemmatize is False:
-            lemmatized = [word for word, _ in filtered]
-        else:
-            lemmatized = [
-                self.lemmatize(word, pos=POS_INV_MAPPING.get(
-                    tag, nltk.corpus.reader.wordnet.NOUN))
-                for word, tag in filtered]
-
-        # stem
-        if self.stem is False:
-            stemmed = lemmatized
-        else:
-            stemmed = [self.stem(word) for word in lemmatized]
+        return [self._process(tokens) for tokens in tokenized]
+
+    def _process(self, tokens):
+        for stage in self._stages:
+            tokens = stage(tokens)
+        return tokens
+
+    def _remove_stopwords(self, words):
+        return [word for word in words if word not in self._stopwords]
+
+    def _remove_tagged_stopwords(self, pos_tagged):
+        return [(word, tag) for word, tag in pos_tagged
+                if word not in self._stopwords]
+
+    def _filter_pos(self, pos_tagged):
+        return [(word, tag) for word, tag in pos_tagged
+                if (tag in self._tags) == self._keep_tags]
+
+    def _remove_tags(self, pos_tagged):
+        return [word for word, _ in pos_tagged]
+
+    def _lemmatize_and_stem_tagged(self, pos_tagged):
+        noun = nltk.corpus.reader.wordnet.NOUN
+        return [self._normalize((word, POS_INV_MAPPING.get(tag, noun)))
+                for word, tag in pos_tagged]
+
+    def _stem_words(self, words):
+        return [self._normalize((word, None)) for word in words]
 
-        # filter short stems
-        return [stem for stem in stemmed if len(stem) > self.min_length]
+    def _remove_short(self, stems):
+        return [stem for stem in stems if len(stem) > self.min_length]
@@ -33,13 +33,28 @@ from sklearn.feature_extraction.text import CountVectorizer, TfidfTransformer
 
 
 class TFIDF(object):
-
-    def __init__(self, preprocessing=None, binary=False):
+    """TF-IDF
+
+    Parameters
+    ----------
+    preprocessing : callable, optional
+        Text pre-processing (text --> list of terms).
+        Defaults to TextPreProcessing().
+    binary : boolean, optional
+        Only count presence of terms. Defaults to False.
+    n_jobs : int, optional
+        Number of worker processes used to pre-process documents (only with
+        TextPreProcessing, see `TextPreProcessing.batch`). Defaults to 1.
+        Use None for as many workers as CPUs.
+    """
+
+    def __init__(self, preprocessing=None, binary=False, n_jobs=1):
         super(TFIDF, self).__init__()
 
         if preprocessing is None:
             preprocessing = TextPreProcessing()
         self.preprocessing = preprocessing
+        self.n_jobs = n_jobs
 
         _ = lambda x: x
         self._cv = CountVectorizer(tokenizer=_, analyzer=_, preprocessor=_,
@@ -47,13 +62,18 @@ class TFIDF(object):
         self._tfidf = TfidfTransformer(
             norm=u'l2', use_idf=True, smooth_idf=True, sublinear_tf=False)
 
+    def _preprocess(self, documents):
+        # pos-tag all documents at once when possible
+        if isinstance(self.preprocessing, TextPreProcessing):
+            return self.preprocessing.batch(documents, n_jobs=self.n_jobs)
+        return [self.preprocessing(d) for d in documents]
+
     def fit(self, documents):
-        counts = self._cv.fit_transform(
-            [self.preprocessing(d) for d in documents])
+        counts = self._cv.fit_transform(self._preprocess(documents))
         self._tfidf.fit(counts)
 
     def transform(self, documents):
-        counts = self._cv.transform([self.preprocessing(d) for d in documents])
+        counts = self._cv.transform(self._preprocess(documents))
         return self._tfidf.transform(counts)
 
 
@@ -27,10 +27,11 @@
 # Hervé BREDIN - http://herve.niderb.fr
 
 """
-Compute MFCC coefficients from an audio file
+Compute MFCC coefficients from an audio file (or a whole corpus)
 
 Usage:
-  mfcc [-n <coefs>] [-D] [--DD] [-e] [--De] [--DDe] [--numpy] <input.wav> <output.pkl>
+  mfcc [-n <coefs>] [-D] [--DD] [-e] [--De] [--DDe] [--numpy | --hdf5 [--compression=<filter>]] [--backend=<name>] [--sample-rate=<Hz>] [--profile] <input.wav> <output.pkl>
+  mfcc [-n <coefs>] [-D] [--DD] [-e] [--De] [--DDe] [--numpy | --hdf5 [--compression=<filter>]] [--backend=<name>] [--sample-rate=<Hz>] [--jobs=<N>] [--force] [--profile] --batch <input> <output_dir>
   mfcc -h | --help
   mfcc --version
 
@@ -41,38 +42,258 @@ Options:
   -D --D                   Append first derivatives.
   --DDe                    Append energy second derivative.
   --DD                     Append second derivatives.
-  --numpy                  Save as numpy array.
+  --numpy                  Save as numpy array (and sliding window metadata
+                           as JSON in <output.pkl>.json).
+  --hdf5                   Save into HDF5 feature store <output.pkl> (or
+                           <output_dir> in batch mode), under input file
+                           name (requires h5py).
+  --compression=<filter>   Compress HDF5 features with "gzip" or "lzf".
+  --backend=<name>         Use "yaafe" or "numpy" backend [default: yaafe].
+  --sample-rate=<Hz>       Sample rate of input files [default: 16000].
+  --batch                  Process all files of <input> (either a text file
+                           containing one path per line, a glob pattern
+                           such as "corpus/*.wav", or a single .wav file)
+                           into <output_dir>.
+  --jobs=<N>               Number of worker processes [default: 1].
+  --force                  Process files even when their output is up to date.
+  --profile                Print time spent in each extraction stage (not
+                           available with --jobs > 1).
   -h --help                Show this screen.
   --version                Show version.
 """
 
+from __future__ import print_function
+
 from pyannote.features.audio.yaafe import YaafeMFCC
+from pyannote.features.audio.profiling import Profiler
+from pyannote.features.audio.reader import AudioReader
+from pyannote.features.audio.store import FeatureStore, save_npy
 from docopt import docopt
-import numpy as np
+import glob
+import os.path
 import pickle
+import sys
+import time
 
 
 FMT_PICKLE = 'pkl'
 FMT_NUMPY = 'npy'
+FMT_HDF5 = 'h5'
 
 
-def do_it(input_wav, output_file, format=FMT_PICKLE,
-          sample_rate=16000, block_size=512, step_size=256,
-          e=False, coefs=11, De=False, DDe=False, D=False, DD=False):
+def get_extractor(sample_rate=16000, block_size=512, step_size=256,
+                  e=False, coefs=11, De=False, DDe=False, D=False, DD=False,
+                  backend='yaafe'):
 
-    extractor = YaafeMFCC(
+    return YaafeMFCC(
         sample_rate=sample_rate, block_size=block_size, step_size=step_size,
-        e=e, coefs=coefs, De=De, DDe=DDe, D=D, DD=DD)
+        e=e, coefs=coefs, De=De, DDe=DDe, D=D, DD=DD, backend=backend)
+
+
+def get_uri(input_wav, root=None):
+    """Get input file name relative to `root` (basename by default)"""
+
+    if root is None:
+        return os.path.splitext(os.path.basename(input_wav))[0]
+
+    path = os.path.relpath(os.path.abspath(input_wav), root)
+    return os.path.splitext(path)[0].replace(os.sep, '/')
+
+
+def get_root(input_wavs):
+    """Get deepest directory containing all `input_wavs`"""
+
+    dirnames = [os.path.dirname(os.path.abspath(input_wav)).split(os.sep)
+                for input_wav in input_wavs]
+    return os.sep.join(os.path.commonprefix(dirnames)) or os.sep
+
 
-    features = extractor.extract(input_wav)
+def get_uris(input_wavs):
+    """Get unique name of each input file
 
-    with open(output_file, 'wb') as f:
+    Input files are named after their path relative to the deepest
+    directory containing all of them (i.e. after their basename when they
+    all are in the same directory).
 
-        if format == FMT_PICKLE:
+    Raises
+    ------
+    ValueError
+        When two input files share the same name.
+    """
+
+    if not input_wavs:
+        return {}
+
+    root = get_root(input_wavs)
+
+    uris, seen = {}, {}
+    for input_wav in input_wavs:
+        uri = get_uri(input_wav, root=root)
+        if uri in seen:
+            raise ValueError(
+                '"{wav}" and "{other}" would both be saved as "{uri}".'.format(
+                    wav=input_wav, other=seen[uri], uri=uri))
+        seen[uri] = input_wav
+        uris[input_wav] = uri
+
+    return uris
+
+
+def save(features, output_file, format=FMT_PICKLE, extractor=None):
+
+    dirname = os.path.dirname(output_file)
+    if dirname and not os.path.isdir(dirname):
+        os.makedirs(dirname)
+
+    if format == FMT_PICKLE:
+        with open(output_file, 'wb') as f:
             pickle.dump(features, f)
 
-        elif format == FMT_NUMPY:
-            np.save(f, features.data)
+    elif format == FMT_NUMPY:
+        # sliding window metadata is stored in output_file.json
+        save_npy(output_file, features, extractor=extractor)
+
+
+def print_profile(profiler):
+    print(profiler.report(), file=sys.stderr)
+
+
+def do_it(input_wav, output_file, format=FMT_PICKLE, compression=None,
+          profile=False, **kwargs):
+
+    extractor = get_extractor(**kwargs)
+
+    if profile:
+        profiler = Profiler()
+        with profiler.attach(extractor):
+            features = extractor.extract(input_wav)
+        print_profile(profiler)
+    else:
+        features = extractor.extract(input_wav)
+
+    if format == FMT_HDF5:
+        with FeatureStore(output_file, mode='a',
+                          compression=compression) as store:
+            store.write(get_uri(input_wav), features, extractor=extractor)
+        return
+
+    save(features, output_file, format=format, extractor=extractor)
+
+
+def get_input_wavs(input):
+    """Get list of wav files from file list, wav file or glob pattern"""
+
+    if os.path.isfile(input):
+
+        # a single wav file (e.g. glob pattern matching a literal file name)
+        if os.path.splitext(input)[1].lower() == '.wav':
+            return [input]
+
+        with open(input, 'r') as f:
+            return [line.strip() for line in f if line.strip()]
+
+    return sorted(glob.glob(input))
+
+
+def is_up_to_date(input_wav, output_file):
+    return os.path.exists(output_file) and \
+        os.path.getmtime(output_file) >= os.path.getmtime(input_wav)
+
+
+def do_batch(input_wavs, output_dir, format=FMT_PICKLE, n_jobs=1,
+             force=False, compression=None, profile=False, **kwargs):
+    """Process all `input_wavs` into `output_dir`
+
+    Output files are named after input files path relative to the deepest
+    directory containing all of them (see `get_uris`). Input files whose
+    output is already up to date are skipped (unless `force` is True).
+
+    With FMT_HDF5 format, `output_dir` is the path to the feature store and
+    input files already in the store are considered up to date.
+
+    Returns
+    -------
+    n_errors : int
+        Number of files that could not be processed.
+
+    Raises
+    ------
+    ValueError
+        When two input files share the same name (before processing any).
+    """
+
+    uris = get_uris(input_wavs)
+
+    store = None
+
+    if format == FMT_HDF5:
+        store = FeatureStore(output_dir, mode='a', compression=compression)
+
+        def up_to_date(input_wav):
+            return uris[input_wav] in store
+
+    else:
+        if not os.path.isdir(output_dir):
+            os.makedirs(output_dir)
+
+        def get_output_file(input_wav):
+            return os.path.join(output_dir, *'{uri}.{format}'.format(
+                uri=uris[input_wav], format=format).split('/'))
+
+        def up_to_date(input_wav):
+            return is_up_to_date(input_wav, get_output_file(input_wav))
+
+    todo = [input_wav for input_wav in input_wavs
+            if force or not up_to_date(input_wav)]
+    n_skipped = len(input_wavs) - len(todo)
+
+    extractor = get_extractor(**kwargs)
+
+    profiler = None
+    if profile:
+        if n_jobs != 1:
+            raise ValueError(
+                'profiling does not cover extraction in worker processes.')
+        profiler = Profiler()
+        extractor.profiler = profiler
+
+    n_files, n_errors, duration = 0, 0, 0.
+    t = time.time()
+
+    for input_wav, features, error in extractor.extract_many(
+            todo, n_jobs=n_jobs, ordered=False):
+
+        if error is not None:
+            print('{wav}: {error}'.format(wav=input_wav, error=error),
+                  file=sys.stderr)
+            n_errors += 1
+            continue
+
+        if store is None:
+            save(features, get_output_file(input_wav), format=format,
+                 extractor=extractor)
+        else:
+            store.write(uris[input_wav], features, extractor=extractor)
+        duration += AudioReader(input_wav).duration
+        n_files += 1
+
+    elapsed = time.time() - t
+
+    if store is not None:
+        store.close()
+
+    print('{n_files:d} files processed ({n_skipped:d} up to date, '
+          '{n_errors:d} errors) in {elapsed:.1f}s: '
+          '{files:.1f} files/s, {speed:.1f} audio-seconds/s'.format(
+              n_files=n_files, n_skipped=n_skipped, n_errors=n_errors,
+              elapsed=elapsed, files=n_files / elapsed if elapsed else 0.,
+              speed=duration / elapsed if elapsed else 0.))
+
+    if profiler is not None:
+        print_profile(profiler)
+
+    return n_errors
+
 
 if __name__ == '__main__':
 
@@ -84,14 +305,45 @@ if __name__ == '__main__':
     D = arguments['--D']
     DDe = arguments['--DDe']
     DD = arguments['--DD']
-
-    input_wav = arguments['<input.wav>']
-    output_file = arguments['<output.pkl>']
+    backend = arguments['--backend']
+    sample_rate = int(arguments['--sample-rate'])
 
     if arguments['--numpy']:
         format = FMT_NUMPY
+    elif arguments['--hdf5']:
+        format = FMT_HDF5
     else:
         format = FMT_PICKLE
+    compression = arguments['--compression']
+    profile = arguments['--profile']
+
+    if arguments['--batch']:
+
+        input_wavs = get_input_wavs(arguments['<input>'])
+        output_dir = arguments['<output_dir>']
+        n_jobs = int(arguments['--jobs'])
+        force = arguments['--force']
+
+        if profile and n_jobs != 1:
+            sys.exit('--profile cannot be used with --jobs > 1 (extraction '
+                     'in worker processes is not profiled).')
+
+        try:
+            get_uris(input_wavs)
+        except ValueError as error:
+            sys.exit(str(error))
+
+        n_errors = do_batch(input_wavs, output_dir, format=format,
+                            n_jobs=n_jobs, force=force,
+                            compression=compression, profile=profile,
+                            e=e, coefs=coefs, De=De, DDe=DDe, D=D, DD=DD,
+                            backend=backend, sample_rate=sample_rate)
+        sys.exit(1 if n_errors else 0)
+
+    input_wav = arguments['<input.wav>']
+    output_file = arguments['<output.pkl>']
 
-    do_it(input_wav, output_file, format=format,
-          e=e, coefs=coefs, De=De, DDe=DDe, D=D, DD=DD)
+    do_it(input_wav, output_file, format=format, compression=compression,
+          profile=profile,
+          e=e, coefs=coefs, De=De, DDe=DDe, D=D, DD=DD, backend=backend,
+          sample_rate=sample_rate)
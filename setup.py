@@ -39,7 +39,7 @@ setup(
 
     # package
     namespace_packages=['pyannote'],
-    packages=find_packages(),
+    packages=find_packages(exclude=['benchmarks', 'benchmarks.*']),
     scripts=[
         'scripts/mfcc.py',
     ],
@@ -47,9 +47,12 @@ setup(
         'pyannote.core >= 0.6.5',
         'scikit-learn >=0.14',
         'nltk >= 3.1',
-        'scipy >= 0.10.0',
+        'scipy >= 0.18',
         'docopt >= 0.6.2'
     ],
+    extras_require={
+        'hdf5': ['h5py >= 2.6'],
+    },
     # versioneer
     version=versioneer.get_version(),
     cmdclass=versioneer.get_cmdclass(),